@@ -0,0 +1,143 @@
+import hashlib
+import json
+import operator
+
+
+OPS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "in": lambda a, b: a in b,
+}
+
+
+def default_rules(indicators) -> list:
+    """
+    The two original persistence flags, a green-count regime with hysteresis, and
+    RED->GREEN / GREEN->RED held transitions for every indicator.
+
+    Rule kinds:
+      persist     metric satisfies (op, value) for the last `runs` runs
+      hysteresis  enters after `enter` holds `enter_runs` runs, exits after `exit` holds `exit_runs`
+      transition  indicator moved `from` -> `to` and has held `to` for at least `runs` runs;
+                  statuses listed in `through` (e.g. YELLOW) may sit in between and are skipped over
+    Metrics: "green_count" or "status:<indicator>".
+    """
+    rules = [
+        {"name": "risk_window_opening", "kind": "persist", "metric": "green_count", "op": ">=", "value": 4, "runs": 10},
+        {"name": "stand_down_persist", "kind": "persist", "metric": "green_count", "op": "<=", "value": 2, "runs": 5},
+        {
+            "name": "risk_on_regime", "kind": "hysteresis", "metric": "green_count",
+            "enter": [">=", 4], "enter_runs": 3, "exit": ["<=", 2], "exit_runs": 3,
+        },
+    ]
+    for ind in indicators:
+        # Trend indicators have a flat band, so real regime changes usually pass through YELLOW
+        rules.append({"name": f"{ind}_red_to_green", "kind": "transition", "indicator": ind,
+                      "from": "RED", "to": "GREEN", "runs": 3, "through": ["YELLOW"]})
+        rules.append({"name": f"{ind}_green_to_red", "kind": "transition", "indicator": ind,
+                      "from": "GREEN", "to": "RED", "runs": 2, "through": ["YELLOW"]})
+        rules.append({"name": f"{ind}_red_persist", "kind": "persist", "metric": f"status:{ind}",
+                      "op": "==", "value": "RED", "runs": 5})
+    return rules
+
+
+def _fingerprint(rule: dict) -> str:
+    # A changed rule definition invalidates its incremental state
+    return hashlib.sha1(json.dumps(rule, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def _metric(run: dict, metric: str):
+    if metric == "green_count":
+        return run.get("green_count", 0)
+    if metric.startswith("status:"):
+        return (run.get("statuses") or {}).get(metric.split(":", 1)[1])
+    raise ValueError(f"Unknown alert metric: {metric}")
+
+
+def _holds(run: dict, metric: str, op: str, value) -> bool:
+    v = _metric(run, metric)
+    return v is not None and OPS[op](v, value)
+
+
+def _step(rule: dict, st: dict, run: dict):
+    """
+    Advances one rule's state by one run in O(1).
+    """
+    kind = rule["kind"]
+
+    if kind == "persist":
+        st["streak"] = st.get("streak", 0) + 1 if _holds(run, rule["metric"], rule["op"], rule["value"]) else 0
+        st["active"] = st["streak"] >= rule["runs"]
+
+    elif kind == "hysteresis":
+        enter = _holds(run, rule["metric"], *rule["enter"])
+        exit_ = _holds(run, rule["metric"], *rule["exit"])
+        st["enter_streak"] = st.get("enter_streak", 0) + 1 if enter else 0
+        st["exit_streak"] = st.get("exit_streak", 0) + 1 if exit_ else 0
+        if not st.get("active") and st["enter_streak"] >= rule["enter_runs"]:
+            st["active"] = True
+        elif st.get("active") and st["exit_streak"] >= rule["exit_runs"]:
+            st["active"] = False
+        st.setdefault("active", False)
+
+    elif kind == "transition":
+        # `origin` is the last status that was neither `to` nor a skipped-over one; runs in a
+        # `through` status (or with no status) leave the rule exactly as it was
+        status = (run.get("statuses") or {}).get(rule["indicator"])
+        if status is not None and status not in rule.get("through", []):
+            if status == rule["to"]:
+                st["streak"] = st.get("streak", 0) + 1
+            else:
+                st["origin"] = status
+                st["streak"] = 0
+        st["active"] = st.get("origin") == rule["from"] and st.get("streak", 0) >= rule["runs"]
+
+    else:
+        raise ValueError(f"Unknown alert rule kind: {kind}")
+
+
+def update_alerts(state: dict, rules: list) -> list:
+    """
+    Applies the newest run in state["runs"] to every rule's stored state and returns the
+    rules that switched on/off with it. Rules without state (new or redefined) are first
+    rebuilt from the runs still in history; after that each run costs O(rules).
+    """
+    runs = state.get("runs", [])
+    if not runs:
+        return []
+    run = runs[-1]
+
+    alerts = state.setdefault("alerts", {"rules": {}, "last_run_ts": None})
+    if alerts.get("last_run_ts") == run.get("ts"):
+        return []  # already applied
+
+    events = []
+    for rule in rules:
+        fp = _fingerprint(rule)
+        st = alerts["rules"].get(rule["name"])
+        if st is None or st.get("fp") != fp:
+            st = {"fp": fp}
+            for past in runs[:-1]:
+                _step(rule, st, past)
+            alerts["rules"][rule["name"]] = st
+
+        was = st.get("active", False)
+        _step(rule, st, run)
+        if st["active"] != was:
+            events.append({"rule": rule["name"], "event": "entered" if st["active"] else "exited", "ts": run.get("ts")})
+
+    # Forget rules that were removed from the rule set
+    names = {r["name"] for r in rules}
+    for name in [n for n in alerts["rules"] if n not in names]:
+        del alerts["rules"][name]
+
+    alerts["last_run_ts"] = run.get("ts")
+    return events
+
+
+def active_alerts(state: dict) -> list:
+    return sorted(n for n, st in (state.get("alerts") or {}).get("rules", {}).items() if st.get("active"))
@@ -0,0 +1,272 @@
+"""
+Synthetic load benchmark for the full pipeline (dashboard.run_pipeline, minus sending the email).
+
+Each scale point runs in a fresh process inside a temp directory, with:
+  - N synthetic tickers of H daily closes, served by local stand-in fetchers that also
+    write the price store like the real ones; the first ten stand in for the dashboard's
+    tickers/yields and all N feed an extra cross-asset correlation indicator
+  - F RSS feeds of M items each on a local HTTP server (through the real feed parser,
+    seen index, dedup and scoring)
+  - a state/history.json with K runs, restored before each pipeline run
+
+Usage:
+  python benchmark.py                               # default sweep, one factor at a time
+  python benchmark.py --tickers 10,100,400 --items 25,500 --json bench.json
+"""
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+BASE = {"tickers": 10, "history": 130, "items": 25, "feeds": 4, "state_runs": 60}
+
+DEFAULT_SWEEP = {
+    "tickers": [10, 50, 200],
+    "history": [130, 500, 2000],
+    "items": [25, 200, 1000],
+    "feeds": [4, 25, 100],
+    "state_runs": [60, 1000, 10000],
+}
+
+WORDS = (
+    "market rates inflation earnings outlook housing jobs energy oil tech shares bonds yields "
+    "growth consumer retail policy trade exports dollar loonie central quarter forecast"
+).split()
+BAD = ["bank", "default", "recession", "layoff", "downgrade", "liquidity", "stress", "bankrupt"]
+
+# Real input name -> synthetic ticker index (series shape is all that matters to the indicators)
+REAL_SERIES = ["us_hy_oas", "us_real_10y", "ca_10y_nominal", "ca_hy", "btc", "spy", "qqq", "dia", "iwm",
+               "xic", "hyg", "xre", "vnq"]
+
+
+def _rss(feed: int, items: int, rng) -> bytes:
+    now = datetime.now(timezone.utc)
+    step = timedelta(hours=72) / max(items, 1)  # a third of each feed falls past the 48h cutoff
+    parts = []
+    for i in range(items):
+        words = rng.choice(WORDS, size=10).tolist()
+        if rng.random() < 0.3:
+            words += rng.choice(BAD, size=2, replace=False).tolist()
+        # ~10% of stories are syndicated: the same headline shows up in every feed at slot i
+        if rng.random() < 0.1:
+            title = f"Syndicated story {i} on bank default and recession risk"
+        else:
+            title = " ".join(words)
+        parts.append(
+            f"<item><title>{title}</title><link>http://bench.local/{feed}/{i}</link>"
+            f"<guid>{feed}-{i}</guid><pubDate>{format_datetime(now - step * i)}</pubDate>"
+            f"<description>&lt;p&gt;{' '.join(rng.choice(WORDS, size=40).tolist())}&lt;/p&gt;</description></item>"
+        )
+    return (f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>bench {feed}</title>'
+            f'<link>http://bench.local/</link>{"".join(parts)}</channel></rss>').encode("utf-8")
+
+
+def _serve_feeds(feeds: dict):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = feeds.get(self.path)
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body or b"")))
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _history(runs: int, names: list) -> dict:
+    statuses = ["RED", "YELLOW", "GREEN"]
+    start = datetime.now(timezone.utc) - timedelta(hours=12 * runs)
+    out = []
+    for i in range(runs):
+        st = {n: statuses[(i + j) % 3] for j, n in enumerate(names)}
+        out.append({
+            "ts": (start + timedelta(hours=12 * i)).isoformat(),
+            "green_count": sum(1 for v in st.values() if v == "GREEN"),
+            "statuses": st,
+        })
+    return {"runs": out}
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0  # KB on Linux
+
+
+def run_point(params: dict, repeat: int = 2) -> dict:
+    """
+    One scale point, in the current process (call via a fresh process for clean RSS numbers).
+    Runs inside a temporary directory that is removed afterwards.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="dd-bench-") as tmp:
+        os.chdir(tmp)  # every store (state/*, site/) resolves relative to the working directory
+        try:
+            return _run_point(params, repeat)
+        finally:
+            os.chdir(cwd)  # step out before the directory is deleted
+
+
+def _run_point(params: dict, repeat: int) -> dict:
+    import numpy as np
+    import pandas as pd
+
+    import dashboard
+    import indicator_defs
+    import registry
+    from correlation_engine import average_correlation_series
+    from data_sources import _store
+
+    rss_mb_start = _peak_rss_mb()
+    rng = np.random.default_rng(7)
+
+    # --- price stand-ins ---
+    n, h = params["tickers"], params["history"]
+    idx = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=h)
+    rets = rng.normal(0.0002, 0.01, size=(h, n)) + rng.normal(0, 0.006, size=(h, 1))  # one common factor
+    prices = 100 * np.exp(np.cumsum(rets, axis=0))
+    tickers = [f"SYN{i:04d}" for i in range(n)]
+
+    def fetcher(i):
+        def _fetch():
+            s = pd.Series(prices[:, i], index=idx, name=tickers[i])
+            _store(tickers[i], s)  # same store write the real fetchers do
+            return s
+        return _fetch
+
+    for i, t in enumerate(tickers):
+        registry.register_input(t, fetcher(i))
+    for j, name in enumerate(REAL_SERIES):
+        registry.register_input(name, fetcher(j % n))
+
+    def bench_corr(*series):
+        df = pd.concat(series, axis=1).pct_change().dropna()
+        avg = average_correlation_series(df, lookbacks=(10, 20, 60))
+        last = avg.iloc[-1]
+        return {"combined": "RED" if last[10] >= 0.75 else ("GREEN" if last[10] <= 0.55 else "YELLOW"),
+                "avg_corr": {int(k): float(v) for k, v in last.items()}}
+
+    registry.register_indicator("bench_correlations", "Synthetic Cross-Asset Correlation",
+                                inputs=tickers, compute=bench_corr)
+
+    # --- RSS stand-ins ---
+    feeds = {f"/feed/{f}.xml": _rss(f, params["items"], rng) for f in range(params["feeds"])}
+    server = _serve_feeds(feeds)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [base + p for p in feeds]
+    indicator_defs.NEWS_FEEDS = urls
+    indicator_defs.BOC_PRESS_RSS, indicator_defs.FED_PRESS_RSS = urls[0], urls[min(1, len(urls) - 1)]
+
+    # --- state stand-in ---
+    os.makedirs("state", exist_ok=True)
+    history = _history(params["state_runs"], list(registry.INDICATORS))
+
+    runs = []
+    try:
+        for r in range(repeat):
+            # Rewritten before every run: add_run trims history, so a later run would otherwise see 60 runs, not K
+            with open("state/history.json", "w") as fh:
+                json.dump(history, fh)
+            t0 = time.perf_counter()
+            _, body, html, results = dashboard.run_pipeline(f"bench run {r}")
+            total = time.perf_counter() - t0
+            runs.append({
+                "total_s": total,
+                "stages": dict(results["meta"]["timings"]["stages"]),
+                "email_bytes": len(body.encode("utf-8")),
+                "html_bytes": len(html.encode("utf-8")),
+                "errors": list(results["meta"]["errors"]),
+            })
+            time.sleep(1.0)  # run ids have one-second resolution
+    finally:
+        server.shutdown()
+    return {
+        "params": params,
+        "runs": runs,
+        "rss_mb_after_imports": rss_mb_start,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _points(sweep: dict) -> list:
+    points = []
+    for factor, values in sweep.items():
+        for v in values:
+            p = dict(BASE, **{factor: v})
+            if p not in [q for _, q in points]:
+                points.append((factor, p))
+    return points
+
+
+def _slope(xs, ys):
+    # log-log slope between the smallest and largest scale: ~1 linear, ~2 quadratic
+    if len(xs) < 2 or min(xs) <= 0 or min(ys) <= 0 or xs[0] == xs[-1]:
+        return float("nan")
+    return math.log(ys[-1] / ys[0]) / math.log(xs[-1] / xs[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark for the dashboard pipeline")
+    for factor in DEFAULT_SWEEP:
+        parser.add_argument(f"--{factor.replace('_', '-')}", help=f"comma-separated values (default {DEFAULT_SWEEP[factor]})")
+    parser.add_argument("--repeat", type=int, default=2, help="pipeline runs per point (first is cold)")
+    parser.add_argument("--json", help="write raw results to this file")
+    args = parser.parse_args()
+
+    sweep = {}
+    for factor, default in DEFAULT_SWEEP.items():
+        raw = getattr(args, factor)
+        sweep[factor] = [int(v) for v in raw.split(",")] if raw else default
+
+    ctx = mp.get_context("spawn")
+    results = []
+    for factor, params in _points(sweep):
+        # Fresh interpreter per point: peak RSS is a process high-water mark
+        with ctx.Pool(1) as pool:
+            res = pool.apply(run_point, (params, args.repeat))
+        res["factor"] = factor
+        results.append(res)
+
+        last = res["runs"][-1]
+        stages = "  ".join(f"{k}={v * 1000:.0f}ms" for k, v in last["stages"].items())
+        print(f"[{factor}={params[factor]}] cold={res['runs'][0]['total_s']:.2f}s warm={last['total_s']:.2f}s "
+              f"peak_rss={res['peak_rss_mb']:.0f}MB  {stages}")
+        for err in last["errors"]:
+            print(f"    ! {err}")
+
+    print("\nScaling (log-log slope of warm run time vs factor; ~1 = linear):")
+    for factor in sweep:
+        # The base point is shared by every factor's sweep
+        group = sorted((r for r in results if all(r["params"][k] == BASE[k] for k in BASE if k != factor)),
+                       key=lambda r: r["params"][factor])
+        xs = [r["params"][factor] for r in group]
+        ys = [r["runs"][-1]["total_s"] for r in group]
+        per_stage = {
+            stage: _slope(xs, [r["runs"][-1]["stages"][stage] for r in group])
+            for stage in group[0]["runs"][-1]["stages"]
+        }
+        worst = max(per_stage.items(), key=lambda kv: -1 if math.isnan(kv[1]) else kv[1])
+        mem = [r["peak_rss_mb"] for r in group]
+        print(f"  {factor:<11} {xs} -> total slope {_slope(xs, ys):.2f}, steepest stage {worst[0]} ({worst[1]:.2f}), "
+              f"peak RSS {mem[0]:.0f}->{mem[-1]:.0f}MB")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,3 +7,18 @@ SMTP_PORT = 587
 # These will be GitHub Secrets (not hard-coded)
 EMAIL_USERNAME = None
 EMAIL_PASSWORD = None
+
+# Local memory-mapped price store (one float64 column per ticker/series + shared date index)
+PRICE_STORE_DIR = "state/prices"
+
+# Static dashboard page (same HTML as the email)
+SITE_DIR = "site"
+
+# Flattened per-run results, Parquet partitioned by month (needs pyarrow)
+SNAPSHOT_DIR = "state/snapshots"
+
+# Content-addressed input bundles + per-run manifests for `dashboard.py replay`
+PROVENANCE_DIR = "state/provenance"
+
+# Machine-readable run output (latest.json + runs.ndjson) served by `dashboard.py serve`
+OUTPUT_DIR = "state/output"
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+
+# Rebuild the running sums from scratch this often to stop add/subtract drift on long series
+RESYNC_EVERY = 500
+
+
+def rolling_corr_matrices(returns: np.ndarray, window: int):
+    """
+    Yields (t, corr) for every full window ending at row t of a (T x N) returns array.
+    Maintains running sums of x, x^2 and x*y, adding the newest row and dropping the oldest,
+    so each step costs O(N^2) instead of recomputing the whole window.
+    """
+    x = np.asarray(returns, dtype="float64")
+    T, n = x.shape
+    if T < window or window < 2:
+        return
+
+    # Correlation is shift-invariant; centering keeps the running sums well conditioned
+    x = x - x.mean(axis=0)
+
+    s = x[:window].sum(axis=0)
+    sxy = x[:window].T @ x[:window]
+
+    for t in range(window - 1, T):
+        if t >= window and (t - window + 1) % RESYNC_EVERY == 0:
+            w = x[t - window + 1:t + 1]
+            s = w.sum(axis=0)
+            sxy = w.T @ w
+        elif t >= window:
+            new, old = x[t], x[t - window]
+            s += new - old
+            sxy += np.outer(new, new) - np.outer(old, old)
+
+        cov = sxy - np.outer(s, s) / window
+        var = np.diag(cov).copy()
+        var[var <= 0] = np.nan
+        sd = np.sqrt(var)
+        corr = cov / np.outer(sd, sd)
+        yield t, np.clip(corr, -1.0, 1.0)
+
+
+def mean_off_diagonal(corr: np.ndarray) -> float:
+    """
+    Mean of the upper triangle (excluding the diagonal), ignoring NaN pairs.
+    """
+    iu = np.triu_indices(corr.shape[0], k=1)
+    vals = corr[iu]
+    vals = vals[~np.isnan(vals)]
+    if not len(vals):
+        return float("nan")
+    return float(vals.mean())
+
+
+def average_correlation_series(rets: pd.DataFrame, lookbacks=(10, 20, 60)) -> pd.DataFrame:
+    """
+    Time series of average pairwise correlation for each lookback.
+    `rets` must be aligned returns without missing values (one column per asset).
+    Columns are named by lookback; rows before a full window are NaN.
+    """
+    out = pd.DataFrame(index=rets.index, dtype="float64")
+    values = rets.to_numpy(dtype="float64")
+
+    for lb in lookbacks:
+        col = np.full(len(rets), np.nan)
+        for t, corr in rolling_corr_matrices(values, lb):
+            col[t] = mean_off_diagonal(corr)
+        out[lb] = col
+
+    return out
+
+
+def latest_corr(rets: pd.DataFrame, lookback: int) -> pd.DataFrame:
+    """
+    Correlation matrix over the last `lookback` rows, same shape as rets.tail(lookback).corr().
+    """
+    values = rets.to_numpy(dtype="float64")[-lookback:]
+    corr = None
+    for _, corr in rolling_corr_matrices(values, lookback):
+        pass
+    if corr is None:
+        corr = np.full((rets.shape[1], rets.shape[1]), np.nan)
+    return pd.DataFrame(corr, index=rets.columns, columns=rets.columns)
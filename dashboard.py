@@ -1,11 +1,17 @@
 from datetime import datetime
+import argparse
+import copy
 import os
+import time
 
-from data_sources import fred_series_csv, yahoo_adj_close, boc_series_csv
-from indicators import credit_stress_us_can, real_yields_us_can, high_beta_leadership, asset_correlations, bad_news_reaction
 from emailer import send_email
-from news_policy import fetch_recent_feed_items, policy_actions_indicator
-from news_bad import fetch_recent_news, detect_bad_news
+import indicator_defs  # noqa: F401  (registers inputs + indicators)
+import registry
+from report_html import build_sparklines, render_html, write_site
+from snapshots import append_snapshot, compact_closed_months
+from provenance import new_run_id, record_run, load_run, list_runs
+from output_api import write_run_output, serve
+from alerts import default_rules, update_alerts, active_alerts
 from state_manager import load_state, save_state, add_run, compute_persistence_flags, last_n_summary
 
 def fmt_status(s: str) -> str:
@@ -36,26 +42,12 @@ def build_email(now_et: str, results: dict) -> tuple[str, str]:
         "mw_rss": "https://www.marketwatch.com/rss/topstories",
     }
 
-    # Indicator statuses (only #1 is real for now)
     credit = results["credit_stress"]
     s1 = credit["combined"]
 
-    # Placeholders until wired
-    placeholders = {
-        "policy_actions": "YELLOW",
-        "asset_correlations": "YELLOW",
-        "real_yields": "YELLOW",
-        "bad_news_reaction": "YELLOW",
-        "high_beta": "YELLOW",
-    }
-
     statuses = [
-        ("1. Credit Stress (US+CA)", s1),
-        ("2. Policy Actions (BoC+Fed)", results["policy_actions"]["combined"]),
-        ("3. Asset Correlations", results["asset_correlations"]["combined"]),
-        ("4. Real Yields (US+CA)", results["real_yields"]["combined"]),
-        ("5. Bad News Reaction", results["bad_news_reaction"]["combined"]),
-        ("6. High-Beta Leadership", results["high_beta"]["combined"]),
+        (f"{i}. {spec['label']}", (results.get(name) or {}).get("combined", "YELLOW"))
+        for i, (name, spec) in enumerate(registry.INDICATORS.items(), start=1)
     ]
 
     green_count = sum(1 for _, s in statuses if s == "GREEN")
@@ -67,74 +59,9 @@ def build_email(now_et: str, results: dict) -> tuple[str, str]:
         stand_down = "ACTIVE"
         stand_down_reason = "Credit stress indicator is RED (conservative early protection)."
 
-    # Supportive commentary (non-directive)
-    commentary_lines = []
-    if s1 == "GREEN":
-        commentary_lines.append("Credit conditions are improving on both the U.S. (spreads) and Canada (HY proxy).")
-        commentary_lines.append("If other indicators follow, this becomes a sturdier risk-on backdrop.")
-    elif s1 == "RED":
-        commentary_lines.append("Credit stress is elevated (at least one of U.S. spreads or Canada HY proxy is deteriorating).")
-        commentary_lines.append("This is the most common failure-point for early risk-on attempts.")
-    else:
-        commentary_lines.append("Credit conditions are mixed/unclear (no clean trend yet).")
-        commentary_lines.append("This is typically a ‘watch closely’ zone rather than a signal zone.")
-
-    # Real yields commentary (safe, non-directive)
-    ry = results.get("real_yields", {})
-    ry_s = ry.get("combined", "YELLOW")
-
-    if ry_s == "GREEN":
-        commentary_lines.append("Real yields are easing, indicating looser financial conditions.")
-    elif ry_s == "RED":
-        commentary_lines.append("Real yields are tightening, indicating more restrictive conditions.")
-    else:
-        commentary_lines.append("Real yield conditions remain mixed or unclear.")
-
-    ac = results.get("asset_correlations") or {}
-    ac_s = ac.get("combined", "YELLOW")
-    if ac_s == "GREEN":
-        commentary_lines.append("Cross-asset correlations are lower, suggesting forced selling pressure is easing.")
-    elif ac_s == "RED":
-        commentary_lines.append("Cross-asset correlations are elevated, consistent with mechanical risk-off behavior.")
-    else:
-        commentary_lines.append("Cross-asset correlations are mixed; forced selling signals are not definitive.")
+    # Supportive commentary (non-directive), declared per indicator in indicator_defs
+    commentary_lines = registry.commentary_lines(results)
 
-    # Policy actions commentary (safe, non-directive)
-    pol = results.get("policy_actions") or {}
-    pol_s = pol.get("combined", "YELLOW")
-
-    if pol_s == "GREEN":
-        commentary_lines.append("Policy tone in the last 48 hours leans supportive to liquidity/financial stability.")
-    elif pol_s == "RED":
-        commentary_lines.append("Policy tone in the last 48 hours leans restrictive, prioritizing inflation containment.")
-    else:
-        commentary_lines.append("Policy tone remains neutral or mixed based on recent official updates.")
-        
-    # High-beta leadership commentary (safe, non-directive)
-    hb = results.get("high_beta") or {}
-    hb_s = hb.get("combined", "YELLOW")
-
-    if hb_s == "GREEN":
-        commentary_lines.append(
-            "High-beta assets are leading on relative strength, consistent with liquidity returning."
-        )
-    elif hb_s == "RED":
-        commentary_lines.append(
-            "High-beta assets are lagging, consistent with risk appetite remaining weak."
-        )
-    else:
-        commentary_lines.append(
-            "High-beta leadership is mixed; liquidity signals are not yet decisive."
-        )  
-
-    br = results.get("bad_news_reaction") or {}
-    hits = br.get("bad_hits") or []
-    if hits:
-        body.append("")
-        body.append("Bad-news items detected (last 48h)")
-        for h in hits[:4]:
-            body.append(f"- {h.get('title','')} | {h.get('link','')}")
-            
     subject = f"Deflation Dashboard (CAN+US) — {now_et}"
 
     body = []
@@ -145,7 +72,7 @@ def build_email(now_et: str, results: dict) -> tuple[str, str]:
         body.append(f"{name}: {fmt_status(s)}")
 
     body.append("")
-    body.append(f"GREEN COUNT: {green_count} / 6")
+    body.append(f"GREEN COUNT: {green_count} / {len(statuses)}")
     body.append(f"STAND-DOWN: {stand_down}")
     if stand_down_reason:
         body.append(f"Reason: {stand_down_reason}")
@@ -174,10 +101,22 @@ def build_email(now_et: str, results: dict) -> tuple[str, str]:
     body.append(f"- CBC Business (RSS): {links['cbc_business_rss']}")
     body.append(f"- MarketWatch Top Stories (RSS): {links['mw_rss']}")
 
+    # Only headlines first seen this run; earlier ones were already in a previous email
+    br = results.get("bad_news_reaction") or {}
+    hits = br.get("bad_hits") or []
+    new_hits = [h for h in hits if h.get("new", True)]
+    if new_hits:
+        body.append("")
+        body.append("Bad-news items detected (last 48h)")
+        for h in new_hits:
+            body.append(f"- {h.get('title','')} | {h.get('link','')}")
+    if len(hits) > len(new_hits):
+        body.append(f"- ({len(hits) - len(new_hits)} bad-news item(s) already reported in earlier runs)")
+
     meta = results.get("meta") or {}
     body.append("")
     body.append("Conclusion (Non-Directive)")
-    body.append(f"- Greens: {meta.get('green_count', 'NA')} / 6")
+    body.append(f"- Greens: {meta.get('green_count', 'NA')} / {len(statuses)}")
     body.append(
         f"- Risk window opening (≥4 greens for 10 runs): "
         f"{'YES' if meta.get('risk_window_opening') else 'NO'}"
@@ -191,189 +130,35 @@ def build_email(now_et: str, results: dict) -> tuple[str, str]:
     hb = meta.get("history_bar", "")
     if hb:
         body.append(f"- Recent runs (12): {hb}   (G=≥4 greens, Y=3 greens, R=≤2 greens)")
-        
-    return subject, "\n".join(body)
-
-
-def main():
-    import pandas as pd
-
-    # Defaults so the dashboard never crashes if a fetch fails
-    spy = pd.Series(dtype=float)
-    btc = pd.Series(dtype=float)
-    xic = pd.Series(dtype=float)
-
-    import pandas as pd
-
-    # Defaults so we never crash if a fetch fails
-    spy = pd.Series(dtype=float)
-    btc = pd.Series(dtype=float)
-
-    # Timestamp label (ET)
-    now_et = datetime.now().strftime("%Y-%m-%d %H:%M ET")
-
-    # Fetch data
-    us_hy_oas = fred_series_csv("BAMLH0A0HYM2")  # ICE BofA US HY OAS
-    ca_hy = yahoo_adj_close("XHY.TO", period="6mo")
-
-    credit = credit_stress_us_can(us_hy_oas, ca_hy)
-    us_real_10y = fred_series_csv("DFII10")  # US 10Y TIPS real yield
-    # Canada 10Y nominal yield proxy via BoC CSV (we'll use a stable CSV endpoint)
-    ca_10y_nominal = boc_series_csv(
-    "https://www.bankofcanada.ca/valet/observations/BD.CDN.10YR.DQ.YLD/csv?recent=200"
-)
-
-    real_yields = real_yields_us_can(us_real_10y, ca_10y_nominal)
-    
-    # --- Bad news reaction (guaranteed-defined variables) ---
-    bad_hits = bad_hits if "bad_hits" in locals() else []
-
-    try:
-        bad_reaction = bad_news_reaction(xic=xic, spy=spy, bad_hits=bad_hits)
-    except Exception as e:
-        errors.append(f"Bad news reaction calc failed: {type(e).__name__}: {e}")
-        bad_reaction = {
-            "combined": "YELLOW",
-            "reason": "bad_news_reaction_failed",
-            "bad_hits": bad_hits,
-        }
-    
-    # --- Asset correlation data ---
-    xic = yahoo_adj_close("XIC.TO", period="6mo")
-    hyg = yahoo_adj_close("HYG", period="6mo")
-    xre = yahoo_adj_close("XRE.TO", period="6mo")
-    vnq = yahoo_adj_close("VNQ", period="6mo")
-
-    # reuse existing series where possible:
-    # btc, spy already fetched for high_beta leadership
-    corr = asset_correlations(xic=xic, spy=spy, hyg=hyg, xre=xre, vnq=vnq, btc=btc, lookback=10)
-   
-    # --- High beta leadership data (fail-soft) ---
-    
-    errors = []
-    bad_hits = []
-    
-    try:
-        btc = yahoo_adj_close("BTC-USD", period="6mo")
-    except Exception as e:
-        errors.append(f"BTC-USD fetch failed: {type(e).__name__}: {e}")
-
-    try:
-        spy = yahoo_adj_close("SPY", period="6mo")
-    except Exception as e:
-        errors.append(f"SPY fetch failed: {type(e).__name__}: {e}")
-
-    try:
-        qqq = yahoo_adj_close("QQQ", period="6mo")
-        dia = yahoo_adj_close("DIA", period="6mo")
-        iwm = yahoo_adj_close("IWM", period="6mo")
-        high_beta = high_beta_leadership(btc, spy, qqq, dia, iwm)
-    except Exception as e:
-        errors.append(f"High-beta calc failed: {type(e).__name__}: {e}")
-        high_beta = {"combined": "YELLOW", "reason": "high_beta_failed"}
-
-    # --- Asset correlation data (fail-soft) ---
-    try:
-        xic = yahoo_adj_close("XIC.TO", period="6mo")
-    except Exception as e:
-        errors.append(f"XIC.TO fetch failed: {type(e).__name__}: {e}")
 
-    # --- Bad news reaction (RSS + market response) ---
-    try:
-        news_feeds = [
-            "https://www.bankofcanada.ca/rss/press-releases/",
-            "https://www.federalreserve.gov/feeds/press_all.xml",
-            "https://www.cbc.ca/cmlink/rss-business",
-            "https://www.marketwatch.com/rss/topstories",
-        ]
-        news_items = fetch_recent_news(news_feeds, hours=48)
-        bad_hits = detect_bad_news(news_items)
-    except Exception as e:
-        errors.append(f"Bad news RSS failed: {type(e).__name__}: {e}")
-        bad_hits = []
-
-    try:
-        bad_reaction = bad_news_reaction(xic=xic, spy=spy, bad_hits=bad_hits)
-    except Exception as e:
-        errors.append(f"Bad news reaction calc failed: {type(e).__name__}: {e}")
-        bad_reaction = {"combined": "YELLOW", "reason": "bad_news_reaction_failed", "bad_hits": bad_hits}
+    events = meta.get("alert_events") or []
+    active = meta.get("active_alerts") or []
+    if events or active:
+        body.append("")
+        body.append("Alerts")
+        for ev in events:
+            body.append(f"- {ev['rule']}: {ev['event'].upper()} this run")
+        if active:
+            body.append(f"- Active: {', '.join(active)}")
         
-    try:
-        bad_reaction = bad_news_reaction(
-            xic=xic,
-            spy=spy,
-            bad_hits=bad_hits
-        )
-    except Exception as e:
-        errors.append(f"Bad news reaction calc failed: {type(e).__name__}: {e}")
-        bad_reaction = {
-            "combined": "YELLOW",
-            "reason": "bad_news_reaction_failed",
-            "bad_hits": bad_hits
-        }
-        hyg = yahoo_adj_close("HYG", period="6mo")
-        xre = yahoo_adj_close("XRE.TO", period="6mo")
-        vnq = yahoo_adj_close("VNQ", period="6mo")
-
-        corr = asset_correlations(xic=xic, spy=spy, hyg=hyg, xre=xre, vnq=vnq, btc=btc, lookback=10)
-    except Exception as e:
-        errors.append(f"Asset correlation calc failed: {type(e).__name__}: {e}")
-        corr = {"combined": "YELLOW", "reason": "asset_corr_failed"}
-
-        # --- Policy actions (BoC + Fed) via RSS (fail-soft) ---
-    try:
-        boc_feed = "https://www.bankofcanada.ca/rss/press-releases/"
-        fed_feed = "https://www.federalreserve.gov/feeds/press_all.xml"
-
-        boc_items = fetch_recent_feed_items(boc_feed, hours=48)
-        fed_items = fetch_recent_feed_items(fed_feed, hours=48)
-
-        policy = policy_actions_indicator(boc_items, fed_items)
-    except Exception as e:
-        errors.append(f"Policy RSS failed: {type(e).__name__}: {e}")
-        policy = {"combined": "YELLOW", "reason": "policy_failed"}
+    return subject, "\n".join(body)
 
-        # --- Bad news reaction (RSS + market response) ---
-    try:
-        news_feeds = [
-            "https://www.bankofcanada.ca/rss/press-releases/",
-            "https://www.federalreserve.gov/feeds/press_all.xml",
-            "https://www.cbc.ca/cmlink/rss-business",
-            "https://www.marketwatch.com/rss/topstories",
-        ]
-        news_items = fetch_recent_news(news_feeds, hours=48)
-        bad_hits = detect_bad_news(news_items)
-    except Exception as e:
-        errors.append(f"Bad news RSS failed: {type(e).__name__}: {e}")
-        bad_hits = []
-        
-    results = {
-        "credit_stress": credit,
-        "real_yields": real_yields,
-        "high_beta": high_beta,
-        "asset_correlations": corr,
-        "policy_actions": policy,
-        "bad_news_reaction": bad_reaction,
-    }
 
-    status_map = {
-        "credit_stress": credit["combined"],
-        "policy_actions": policy["combined"],
-        "asset_correlations": corr["combined"],
-        "real_yields": real_yields["combined"],
-        "bad_news_reaction": bad_reaction["combined"],
-        "high_beta": high_beta["combined"],
-    }
+def evaluate_run(inputs: dict, state: dict, run_id: str = None, errors: list = None):
+    """
+    Indicators + run-history bookkeeping for one set of inputs. Mutates `state` (appends the run)
+    but does no I/O, so live runs and replays share it. Returns (results, indicator_timings).
+    """
+    errors = errors if errors is not None else []
+    results, indicator_timings = registry.evaluate(inputs, errors=errors)
 
+    status_map = {name: results[name]["combined"] for name in registry.INDICATORS}
     green_count = sum(1 for v in status_map.values() if v == "GREEN")
 
-    state = load_state()
-    state = add_run(state, green_count=green_count, statuses=status_map)
+    state = add_run(state, green_count=green_count, statuses=status_map, run_id=run_id)
+    alert_events = update_alerts(state, default_rules(registry.INDICATORS))
     risk_window_opening, stand_down_persist = compute_persistence_flags(state)
-    save_state(state)
     history_bar = last_n_summary(state, n=12)
-    results.setdefault("meta", {})
-    results["meta"]["history_bar"] = history_bar
 
     override_reasons = []
     if status_map["credit_stress"] == "RED":
@@ -387,6 +172,7 @@ def main():
     stand_down_active = stand_down_override or stand_down_persist
 
     results["meta"] = {
+        "run_id": run_id,
         "green_count": green_count,
         "risk_window_opening": risk_window_opening,
         "stand_down_active": stand_down_active,
@@ -395,9 +181,91 @@ def main():
             if stand_down_override
             else ("persistence (≤2 greens for 5 runs)" if stand_down_persist else "none")
         ),
+        "history_bar": history_bar,
+        "alert_events": alert_events,
+        "active_alerts": active_alerts(state),
+        "errors": errors,
     }
-   
+    return results, indicator_timings
+
+
+def run_pipeline(now_et: str):
+    """
+    Fetches inputs, evaluates every registered indicator, updates run history, records the
+    inputs for replay and renders the email (plain text + HTML) and the static page.
+    Returns (subject, body, html, results).
+    """
+    errors = []
+    run_id = new_run_id()
+
+    # Wall time per stage (meta["timings"]["stages"]); the benchmark reads these
+    stages = {}
+    mark = [time.perf_counter()]
+
+    def lap(name):
+        now = time.perf_counter()
+        stages[name] = now - mark[0]
+        mark[0] = now
+
+    inputs, input_timings = registry.fetch_inputs(errors=errors)
+    lap("fetch")
+
+    state = load_state()
+    prior_state = copy.deepcopy(state)
+    lap("load_state")
+    results, indicator_timings = evaluate_run(inputs, state, run_id=run_id, errors=errors)
+    results["meta"]["timings"] = {"inputs": input_timings, "indicators": indicator_timings, "stages": stages}
+    lap("indicators")
+    save_state(state)
+    lap("save_state")
+
+    try:
+        record_run(run_id, now_et, inputs, prior_state)
+    except Exception as e:
+        errors.append(f"Provenance bundle failed: {type(e).__name__}: {e}")
+    lap("provenance")
+
+    try:
+        append_snapshot(results, run_id=run_id)
+        compact_closed_months()
+    except Exception as e:
+        errors.append(f"Snapshot export failed: {type(e).__name__}: {e}")
+    lap("snapshot")
+
+    try:
+        write_run_output(results, run_id=run_id, now_et=now_et)
+    except Exception as e:
+        errors.append(f"Run output export failed: {type(e).__name__}: {e}")
+    lap("output")
+
     subject, body = build_email(now_et, results)
+    lap("email")
+
+    # Downsampled once; shared by the HTML email and the static page
+    sparklines = build_sparklines(inputs)
+    html = render_html(now_et, results, sparklines, state["runs"])
+    write_site(html)
+    lap("html")
+
+    return subject, body, html, results
+
+
+def replay(run_id: str):
+    """
+    Re-executes a recorded run offline from its provenance bundle. Nothing is fetched,
+    saved or sent. Returns (subject, body, results).
+    """
+    manifest, inputs, prior_state = load_run(run_id)
+    results, _ = evaluate_run(inputs, prior_state, run_id=run_id)
+    subject, body = build_email(manifest["now_et"], results)
+    return subject, body, results
+
+
+def main():
+    # Timestamp label (ET)
+    now_et = datetime.now().strftime("%Y-%m-%d %H:%M ET")
+
+    subject, body, html, _ = run_pipeline(now_et)
 
     send_email(
         subject=subject,
@@ -406,7 +274,28 @@ def main():
         password=os.environ["EMAIL_PASSWORD"],
         sender=os.environ["EMAIL_FROM"],
         recipient=os.environ["EMAIL_TO"],
+        html=html,
     )
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Deflation → risk-on dashboard")
+    sub = parser.add_subparsers(dest="command")
+    p_replay = sub.add_parser("replay", help="re-run a recorded run offline and print its email")
+    p_replay.add_argument("run_id", nargs="?", help="run id (see state/provenance/runs); omit to list")
+    p_serve = sub.add_parser("serve", help="serve run output as JSON over HTTP")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        if not args.run_id:
+            print("\n".join(list_runs()))
+        else:
+            subject, body, _ = replay(args.run_id)
+            print(subject)
+            print()
+            print(body)
+    elif args.command == "serve":
+        serve(host=args.host, port=args.port)
+    else:
+        main()
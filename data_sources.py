@@ -1,8 +1,23 @@
 import io
+import threading
 import requests
 import pandas as pd
 import yfinance as yf
 
+import price_store
+
+
+# yf.download keeps per-call results in module-level state; concurrent calls can mix tickers
+_YF_LOCK = threading.Lock()
+
+
+def _store(key: str, s: pd.Series, rescale_history: bool = False):
+    # The store is a shared cache; a failed write must never fail the fetch itself
+    try:
+        price_store.write_series(key, s, rescale_history=rescale_history)
+    except Exception as e:
+        print(f"Price store write failed for {key}: {type(e).__name__}: {e}")
+
 
 def fred_series_csv(series_id: str) -> pd.Series:
     url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
@@ -15,7 +30,9 @@ def fred_series_csv(series_id: str) -> pd.Series:
     df["value"] = pd.to_numeric(df["value"], errors="coerce")
     df = df.dropna()
 
-    return df.set_index("date")["value"].sort_index()
+    s = df.set_index("date")["value"].sort_index()
+    _store(series_id, s)
+    return s
 
 
 def yahoo_adj_close(ticker: str, period: str = "6mo") -> pd.Series:
@@ -23,7 +40,8 @@ def yahoo_adj_close(ticker: str, period: str = "6mo") -> pd.Series:
     Pulls Adj Close from Yahoo Finance via yfinance and returns a clean 1-D numeric Series.
     Handles cases where yfinance returns multi-index columns.
     """
-    df = yf.download(ticker, period=period, interval="1d", progress=False, auto_adjust=False, group_by="column")
+    with _YF_LOCK:
+        df = yf.download(ticker, period=period, interval="1d", progress=False, auto_adjust=False, group_by="column")
     if df is None or df.empty:
         raise RuntimeError(f"No data returned for {ticker}")
 
@@ -55,8 +73,40 @@ def yahoo_adj_close(ticker: str, period: str = "6mo") -> pd.Series:
     if not isinstance(s, pd.Series) or s.empty:
         raise RuntimeError(f"Adj Close extraction failed for {ticker}")
 
+    _store(ticker, s, rescale_history=True)  # Adj Close is re-adjusted on every dividend/split
     return s
 
+def yahoo_adj_close_many(tickers: list, period: str = "6mo") -> dict:
+    """
+    Adj Close for several tickers from a single yf.download call.
+    Returns {ticker: Series}; tickers Yahoo had no data for are left out.
+    """
+    tickers = list(tickers)
+    if not tickers:
+        return {}
+    with _YF_LOCK:
+        df = yf.download(tickers, period=period, interval="1d", progress=False, auto_adjust=False,
+                         group_by="column")
+    if df is None or df.empty:
+        raise RuntimeError(f"No data returned for {', '.join(tickers)}")
+    if not isinstance(df.columns, pd.MultiIndex) or "Adj Close" not in df.columns.get_level_values(0):
+        raise RuntimeError("Adj Close missing from batched Yahoo download")
+
+    adj = df["Adj Close"]
+    out = {}
+    for ticker in tickers:
+        if ticker not in adj.columns:
+            continue
+        # The batch shares one index (crypto trades weekends); drop the other tickers' dates
+        s = pd.to_numeric(adj[ticker], errors="coerce").dropna().sort_index()
+        if s.empty:
+            continue
+        s.name = ticker
+        _store(ticker, s, rescale_history=True)  # Adj Close is re-adjusted on every dividend/split
+        out[ticker] = s
+    return out
+
+
 def boc_series_csv(series_url: str) -> pd.Series:
     """
     Pulls a BoC Valet CSV URL and returns a pandas Series indexed by date.
@@ -93,4 +143,7 @@ def boc_series_csv(series_url: str) -> pd.Series:
 
     df = df.dropna(subset=[date_col, value_col])
 
-    return df.set_index(date_col)[value_col].sort_index()
+    s = df.set_index(date_col)[value_col].sort_index()
+    # Stored under the Valet series code (e.g. BD.CDN.10YR.DQ.YLD)
+    _store(str(value_col), s)
+    return s
@@ -1,9 +1,16 @@
 import smtplib
+from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from config import SMTP_SERVER, SMTP_PORT
 
-def send_email(subject, body, username, password, sender, recipient):
-    msg = MIMEText(body)
+def send_email(subject, body, username, password, sender, recipient, html=None):
+    if html:
+        # Plain text stays first so text-only clients still get the full report
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText(body, "plain", "utf-8"))
+        msg.attach(MIMEText(html, "html", "utf-8"))
+    else:
+        msg = MIMEText(body)
     msg["Subject"] = subject
     msg["From"] = sender
     msg["To"] = recipient
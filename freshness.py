@@ -0,0 +1,269 @@
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+
+import price_store
+
+
+# When an observation dated D can first appear, and when it stops changing, as offsets
+# from midnight UTC of the day it is published on. `lag_days` business days after D.
+SOURCES = {
+    # ICE BofA OAS / H.15 TIPS yields land on FRED the next business day
+    "fred": {"calendar": "us_federal", "lag_days": 1, "available": timedelta(hours=0), "final": timedelta(hours=0)},
+    # Valet posts the day's bond yields after the Canadian close
+    "boc": {"calendar": "ca_boc", "lag_days": 0, "available": timedelta(hours=20), "final": timedelta(hours=23)},
+    # Yahoo shows a partial daily bar from the open; final after the close (both DST regimes)
+    "nyse": {"calendar": "nyse", "lag_days": 0, "available": timedelta(hours=13, minutes=30), "final": timedelta(hours=21)},
+    "tsx": {"calendar": "tsx", "lag_days": 0, "available": timedelta(hours=13, minutes=30), "final": timedelta(hours=21)},
+    "crypto": {"calendar": "24x7"},
+}
+
+# Set to bypass the planner (e.g. after a data revision)
+FORCE_ENV = "DASHBOARD_FORCE_FETCH"
+
+
+def _nth_weekday(year, month, weekday, n):
+    d = date(year, month, 1)
+    d += timedelta(days=(weekday - d.weekday()) % 7)
+    return d + timedelta(weeks=n - 1)
+
+
+def _last_weekday(year, month, weekday):
+    d = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = ((h + l - 7 * m + 114) % 31) + 1
+    return date(year, month, day)
+
+
+def _observed(d):
+    # Saturday -> Friday, Sunday -> Monday
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+def _forward(d):
+    # Canadian convention: weekend holidays move to the following Monday
+    return d + timedelta(days=(7 - d.weekday()) % 7) if d.weekday() >= 5 else d
+
+
+@lru_cache(maxsize=None)
+def holidays(calendar: str, year: int) -> frozenset:
+    MON, THU = 0, 3
+    good_friday = _easter(year) - timedelta(days=2)
+
+    if calendar in ("nyse", "us_federal"):
+        days = {
+            _nth_weekday(year, 1, MON, 3),  # MLK
+            _nth_weekday(year, 2, MON, 3),  # Presidents
+            _last_weekday(year, 5, MON),  # Memorial
+            _observed(date(year, 7, 4)),
+            _nth_weekday(year, 9, MON, 1),  # Labor
+            _nth_weekday(year, 11, THU, 4),  # Thanksgiving
+            _observed(date(year, 12, 25)),
+        }
+        if year >= 2022:
+            days.add(_observed(date(year, 6, 19)))
+        new_year = _observed(date(year, 1, 1))
+        if calendar == "nyse":
+            # NYSE doesn't close on a Friday Dec 31 for a Saturday New Year
+            if new_year.year == year:
+                days.add(new_year)
+            days.add(good_friday)
+        else:
+            days.add(new_year)
+            days.add(_nth_weekday(year, 10, MON, 2))  # Columbus
+            days.add(_observed(date(year, 11, 11)))  # Veterans
+        return frozenset(days)
+
+    if calendar in ("tsx", "ca_boc"):
+        xmas = date(year, 12, 25)
+        if xmas.weekday() == 5:
+            xmas_obs, boxing_obs = date(year, 12, 27), date(year, 12, 28)
+        elif xmas.weekday() == 6:
+            xmas_obs, boxing_obs = date(year, 12, 26), date(year, 12, 27)
+        elif xmas.weekday() == 4:
+            xmas_obs, boxing_obs = xmas, date(year, 12, 28)
+        else:
+            xmas_obs, boxing_obs = xmas, date(year, 12, 26)
+
+        victoria = date(year, 5, 24) - timedelta(days=date(year, 5, 24).weekday())
+        days = {
+            _forward(date(year, 1, 1)),
+            _nth_weekday(year, 2, MON, 3),  # Family Day
+            good_friday,
+            victoria,
+            _forward(date(year, 7, 1)),
+            _nth_weekday(year, 8, MON, 1),  # Civic Holiday
+            _nth_weekday(year, 9, MON, 1),  # Labour Day
+            _nth_weekday(year, 10, MON, 2),  # Thanksgiving
+            xmas_obs,
+            boxing_obs,
+        }
+        if calendar == "ca_boc":
+            if year >= 2021:
+                days.add(_forward(date(year, 9, 30)))  # Truth and Reconciliation
+            days.add(_forward(date(year, 11, 11)))  # Remembrance Day
+        return frozenset(days)
+
+    return frozenset()
+
+
+def is_business_day(d: date, calendar: str) -> bool:
+    if calendar == "24x7":
+        return True
+    return d.weekday() < 5 and d not in holidays(calendar, d.year)
+
+
+def add_business_days(d: date, n: int, calendar: str) -> date:
+    step = 1 if n >= 0 else -1
+    while n:
+        d += timedelta(days=step)
+        if is_business_day(d, calendar):
+            n -= step
+    return d
+
+
+def _publish_time(obs: date, spec: dict, which: str) -> datetime:
+    day = add_business_days(obs, spec["lag_days"], spec["calendar"])
+    return datetime.combine(day, time(), tzinfo=timezone.utc) + spec[which]
+
+
+def latest_available(source: str, now: datetime) -> date:
+    """
+    Most recent observation date the source can have published by `now`.
+    """
+    spec = SOURCES[source]
+    if spec["calendar"] == "24x7":
+        return now.date()
+
+    d = now.date()
+    for _ in range(15):
+        if is_business_day(d, spec["calendar"]) and _publish_time(d, spec, "available") <= now:
+            return d
+        d -= timedelta(days=1)
+    return d
+
+
+def needs_fetch(source: str, last_obs, fetched_at, now: datetime = None) -> bool:
+    """
+    True if the source can have something we don't: a newer observation, or a final value
+    for one we only have a partial (e.g. intraday) read of.
+    """
+    now = now or datetime.now(timezone.utc)
+    spec = SOURCES[source]
+    if spec["calendar"] == "24x7" or last_obs is None or fetched_at is None:
+        return True
+
+    last_obs = last_obs.date() if isinstance(last_obs, datetime) else last_obs
+    if last_obs < latest_available(source, now):
+        return True
+    return fetched_at < _publish_time(last_obs, spec, "final")
+
+
+def yahoo_source(ticker: str) -> str:
+    if ticker.endswith("-USD"):
+        return "crypto"
+    if ticker.endswith(".TO"):
+        return "tsx"
+    return "nyse"
+
+
+def plan(keys_sources: dict, now: datetime = None) -> dict:
+    """
+    keys_sources: store key -> source name. Returns store key -> True (fetch) / False (cache is current).
+    """
+    now = now or datetime.now(timezone.utc)
+    if os.environ.get(FORCE_ENV):
+        return {k: True for k in keys_sources}
+    return {
+        key: needs_fetch(source, price_store.last_observation(key), price_store.last_write(key), now)
+        for key, source in keys_sources.items()
+    }
+
+
+def _stored(key: str):
+    try:
+        s = price_store.read_series(key).dropna()
+    except (KeyError, RuntimeError):
+        return None
+    return s if len(s) else None
+
+
+def fresh_or_cached(key: str, source: str, fetch):
+    """
+    Wraps a fetcher: serves the price store's copy when the planner says the source
+    can't have published anything newer, otherwise fetches (which refreshes the store).
+    A failed fetch also falls back to the stored copy, reported in `errors`.
+    Register the result with register_input(..., with_errors=True).
+    """
+    def _get(errors=None):
+        if not plan({key: source})[key]:
+            cached = _stored(key)
+            if cached is not None:
+                return cached
+        try:
+            return fetch()
+        except Exception as e:
+            cached = _stored(key)
+            if cached is None:
+                raise
+            if errors is not None:
+                errors.append(f"{key} fetch failed ({type(e).__name__}: {e}); using stored copy to {cached.index[-1]:%Y-%m-%d}")
+            return cached
+    return _get
+
+
+def fresh_or_cached_many(keys_sources: dict, fetch_many):
+    """
+    Batched fresh_or_cached: fetch_many(keys) is called once, for only the keys the planner
+    says can have something new, and must return {key: Series}. Stale keys the batch fails
+    on (or leaves out) fall back to their stored copies, each reported in `errors`.
+    Returns a fetch(keys, errors) for registry.register_input_group.
+    """
+    def _get(keys, errors=None):
+        errors = errors if errors is not None else []
+        todo = plan({k: keys_sources[k] for k in keys})
+        out = {}
+        for key in keys:
+            if not todo[key]:
+                cached = _stored(key)
+                if cached is not None:
+                    out[key] = cached
+                else:
+                    todo[key] = True
+        stale = [k for k in keys if todo[k]]
+        if not stale:
+            return out
+
+        try:
+            fetched, reason = fetch_many(stale), "no data in batch"
+        except Exception as e:
+            # One bad ticker must not take the whole batch (and every cached ticker) down
+            fetched, reason = {}, f"batch failed ({type(e).__name__}: {e})"
+        for key in stale:
+            if key in fetched:
+                out[key] = fetched[key]
+                continue
+            cached = _stored(key)
+            if cached is not None:
+                errors.append(f"{key} fetch failed: {reason}; using stored copy to {cached.index[-1]:%Y-%m-%d}")
+                out[key] = cached
+            # else: left out, and the registry reports it as a failed fetch
+        return out
+    return _get
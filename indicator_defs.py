@@ -0,0 +1,183 @@
+"""
+Registers the dashboard's inputs and indicators with the registry.
+Adding an indicator = register its inputs (if new) + one register_indicator call.
+"""
+from data_sources import fred_series_csv, yahoo_adj_close_many, boc_series_csv
+from indicators import credit_stress_us_can, real_yields_us_can, high_beta_leadership, asset_correlations, bad_news_reaction
+from news_policy import fetch_recent_feed_items, policy_actions_indicator, policy_item_scores
+from news_bad import fetch_recent_news, detect_bad_news, bad_news_score
+from news_dedup import cluster_items, minhash_signature, signature_hex
+import news_index
+from freshness import fresh_or_cached, fresh_or_cached_many, yahoo_source
+from registry import register_input, register_input_group, register_indicator
+
+
+BOC_PRESS_RSS = "https://www.bankofcanada.ca/rss/press-releases/"
+FED_PRESS_RSS = "https://www.federalreserve.gov/feeds/press_all.xml"
+
+# Read with sorted_by_date: parsing stops at the 48h cutoff only once a feed has actually
+# looked newest-first up to it (MarketWatch top stories is ranked, not dated)
+NEWS_FEEDS = [
+    BOC_PRESS_RSS,
+    FED_PRESS_RSS,
+    "https://www.cbc.ca/cmlink/rss-business",
+    "https://www.marketwatch.com/rss/topstories",
+]
+
+# Canada 10Y nominal yield proxy via BoC CSV (stable Valet endpoint)
+BOC_10Y_CSV = "https://www.bankofcanada.ca/valet/observations/BD.CDN.10YR.DQ.YLD/csv?recent=200"
+
+YAHOO_TICKERS = {
+    "ca_hy": "XHY.TO",
+    "btc": "BTC-USD",
+    "spy": "SPY",
+    "qqq": "QQQ",
+    "dia": "DIA",
+    "iwm": "IWM",
+    "xic": "XIC.TO",
+    "hyg": "HYG",
+    "xre": "XRE.TO",
+    "vnq": "VNQ",
+}
+
+
+def fetch_bad_hits():
+    """
+    Only entries not seen on earlier runs are parsed and scored; the 48h window is
+    rebuilt from the seen index with each item's cached score.
+    """
+    news_seen = news_index.load_index(news_index.NEWS_SEEN_PATH)
+    news_index.evict(news_seen)
+
+    new_items = fetch_recent_news(NEWS_FEEDS, hours=48, seen=news_seen, sorted_by_date=True)
+    # Signatures are taken once, on title + summary, and cached so the 48h window's
+    # de-duplication below compares the same text (the index keeps no summaries)
+    for it in new_items:
+        it["minhash"] = signature_hex(minhash_signature(it))
+        news_index.annotate(news_seen, it["key"], minhash=it["minhash"])
+    # Score one copy per near-duplicate cluster and share it with the rest
+    for members in cluster_items(new_items):
+        score = bad_news_score(new_items[members[0]])
+        for i in members:
+            news_index.annotate(news_seen, new_items[i]["key"], bad_score=score)
+    new_keys = {it["key"] for it in new_items}
+    news_index.save_index(news_seen, news_index.NEWS_SEEN_PATH)
+
+    news_items = news_index.window(news_seen, hours=48, feeds=NEWS_FEEDS)
+    for it in news_items:
+        it["new"] = it["key"] in new_keys
+    return detect_bad_news(news_items)
+
+
+def fetch_policy_items():
+    policy_seen = news_index.load_index(news_index.POLICY_SEEN_PATH)
+    news_index.evict(policy_seen)
+    for feed in (BOC_PRESS_RSS, FED_PRESS_RSS):
+        for it in fetch_recent_feed_items(feed, hours=48, seen=policy_seen, sorted_by_date=True):
+            d, h = policy_item_scores(it)
+            news_index.annotate(policy_seen, it["key"], dovish=d, hawkish=h)
+    news_index.save_index(policy_seen, news_index.POLICY_SEEN_PATH)
+
+    return {
+        "boc": news_index.window(policy_seen, hours=48, feeds=[BOC_PRESS_RSS]),
+        "fed": news_index.window(policy_seen, hours=48, feeds=[FED_PRESS_RSS]),
+    }
+
+
+def fetch_yahoo(names, errors=None):
+    """
+    All Yahoo inputs in one batched download (only tickers the planner says can be newer),
+    keyed back to input names.
+    """
+    tickers = [YAHOO_TICKERS[n] for n in names]
+    by_ticker = fresh_or_cached_many(
+        {t: yahoo_source(t) for t in tickers},
+        lambda stale: yahoo_adj_close_many(stale, period="6mo"),
+    )(tickers, errors)
+    return {n: by_ticker[YAHOO_TICKERS[n]] for n in names if YAHOO_TICKERS[n] in by_ticker}
+
+
+# --- Inputs ---
+# Price/yield inputs are only re-downloaded when their calendar says something new can exist,
+# and fall back to the stored copy (reported in errors) when a download fails
+register_input("us_hy_oas", fresh_or_cached("BAMLH0A0HYM2", "fred", lambda: fred_series_csv("BAMLH0A0HYM2")),
+               with_errors=True)  # ICE BofA US HY OAS
+register_input("us_real_10y", fresh_or_cached("DFII10", "fred", lambda: fred_series_csv("DFII10")),
+               with_errors=True)  # US 10Y TIPS real yield
+register_input("ca_10y_nominal", fresh_or_cached("BD.CDN.10YR.DQ.YLD", "boc", lambda: boc_series_csv(BOC_10Y_CSV)),
+               with_errors=True)
+register_input_group("yahoo", list(YAHOO_TICKERS), fetch_yahoo)
+register_input("bad_hits", fetch_bad_hits)
+register_input("policy_items", fetch_policy_items)
+
+
+# --- Indicators (display order) ---
+register_indicator(
+    "credit_stress", "Credit Stress (US+CA)",
+    inputs=["us_hy_oas", "ca_hy"],
+    compute=credit_stress_us_can,
+    commentary={
+        "GREEN": [
+            "Credit conditions are improving on both the U.S. (spreads) and Canada (HY proxy).",
+            "If other indicators follow, this becomes a sturdier risk-on backdrop.",
+        ],
+        "RED": [
+            "Credit stress is elevated (at least one of U.S. spreads or Canada HY proxy is deteriorating).",
+            "This is the most common failure-point for early risk-on attempts.",
+        ],
+        "YELLOW": [
+            "Credit conditions are mixed/unclear (no clean trend yet).",
+            "This is typically a ‘watch closely’ zone rather than a signal zone.",
+        ],
+    },
+)
+
+register_indicator(
+    "policy_actions", "Policy Actions (BoC+Fed)",
+    inputs=["policy_items"],
+    compute=lambda items: policy_actions_indicator(items["boc"], items["fed"]),
+    commentary={
+        "GREEN": "Policy tone in the last 48 hours leans supportive to liquidity/financial stability.",
+        "RED": "Policy tone in the last 48 hours leans restrictive, prioritizing inflation containment.",
+        "YELLOW": "Policy tone remains neutral or mixed based on recent official updates.",
+    },
+)
+
+register_indicator(
+    "asset_correlations", "Asset Correlations",
+    inputs=["xic", "spy", "hyg", "xre", "vnq", "btc"],
+    compute=lambda *s: asset_correlations(*s, lookback=10),
+    commentary={
+        "GREEN": "Cross-asset correlations are lower, suggesting forced selling pressure is easing.",
+        "RED": "Cross-asset correlations are elevated, consistent with mechanical risk-off behavior.",
+        "YELLOW": "Cross-asset correlations are mixed; forced selling signals are not definitive.",
+    },
+)
+
+register_indicator(
+    "real_yields", "Real Yields (US+CA)",
+    inputs=["us_real_10y", "ca_10y_nominal"],
+    compute=real_yields_us_can,
+    commentary={
+        "GREEN": "Real yields are easing, indicating looser financial conditions.",
+        "RED": "Real yields are tightening, indicating more restrictive conditions.",
+        "YELLOW": "Real yield conditions remain mixed or unclear.",
+    },
+)
+
+register_indicator(
+    "bad_news_reaction", "Bad News Reaction",
+    inputs=["xic", "spy", "bad_hits"],
+    compute=lambda xic, spy, bad_hits: bad_news_reaction(xic=xic, spy=spy, bad_hits=bad_hits or []),
+)
+
+register_indicator(
+    "high_beta", "High-Beta Leadership",
+    inputs=["btc", "spy", "qqq", "dia", "iwm"],
+    compute=high_beta_leadership,
+    commentary={
+        "GREEN": "High-beta assets are leading on relative strength, consistent with liquidity returning.",
+        "RED": "High-beta assets are lagging, consistent with risk appetite remaining weak.",
+        "YELLOW": "High-beta leadership is mixed; liquidity signals are not yet decisive.",
+    },
+)
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from correlation_engine import latest_corr, mean_off_diagonal
+
 
 def _ma(series: pd.Series, n: int) -> float:
     m = series.tail(n).mean()
@@ -156,6 +158,7 @@ def asset_correlations(
     vnq: pd.Series,  # US REITs
     btc: pd.Series,  # bitcoin
     lookback: int = 10,
+    lookbacks=(20, 60),
 ):
     """
     Computes average pairwise correlation of daily returns across assets.
@@ -179,27 +182,24 @@ def asset_correlations(
         return {"combined": "YELLOW", "reason": "insufficient_data"}
 
     # Use returns for correlation
-    rets = df.pct_change().dropna()
-    rets = rets.tail(lookback)
+    all_rets = df.pct_change().dropna()
+    rets = all_rets.tail(lookback)
 
     if rets.shape[0] < lookback or rets.shape[1] < 3:
         return {"combined": "YELLOW", "reason": "insufficient_aligned_data"}
 
-    corr = rets.corr()
-
-    # Average pairwise correlation (upper triangle, excluding diagonal)
-    vals = []
+    corr = latest_corr(rets, lookback)
     cols = list(corr.columns)
-    for i in range(len(cols)):
-        for j in range(i + 1, len(cols)):
-            v = corr.iloc[i, j]
-            if pd.notna(v):
-                vals.append(float(v))
 
-    if not vals:
+    avg_corr = mean_off_diagonal(corr.to_numpy())
+    if pd.isna(avg_corr):
         return {"combined": "YELLOW", "reason": "no_corr_values"}
 
-    avg_corr = sum(vals) / len(vals)
+    # Same measure over longer windows, from the full aligned return history
+    by_lookback = {}
+    for lb in lookbacks:
+        if len(all_rets) >= lb:
+            by_lookback[lb] = mean_off_diagonal(latest_corr(all_rets, lb).to_numpy())
 
     # Thresholds (tunable)
     if avg_corr >= 0.75:
@@ -214,6 +214,7 @@ def asset_correlations(
         "avg_corr": avg_corr,
         "assets_used": cols,
         "lookback_days": lookback,
+        "avg_corr_by_lookback": by_lookback,
         "note": "Higher correlation implies forced selling / risk-off; lower implies dispersion / healthier market."
     }
 def bad_news_reaction(xic: pd.Series, spy: pd.Series, bad_hits: list):
@@ -1,45 +1,78 @@
-import feedparser
 from datetime import datetime, timezone, timedelta
 
+import news_index
+from feed_stream import read_entries
+from news_dedup import collapse_duplicates
 
-def _parse_time(entry):
-    t = getattr(entry, "published_parsed", None) or getattr(entry, "updated_parsed", None)
-    if not t:
-        return None
-    return datetime(*t[:6], tzinfo=timezone.utc)
 
+BAD_TERMS = [
+    "bank", "insolv", "default", "credit event", "liquidity",
+    "layoff", "job cuts", "recession", "downgrade", "guidance cut",
+    "missed expectations", "delinquen", "foreclosure", "bankrupt",
+    "run on", "stress", "bailout"
+]
 
-def fetch_recent_news(feed_urls, hours: int = 48, max_items: int = 25):
+MAX_HITS = 6  # keep email tight; already-reported hits only fill up to this
+
+
+def fetch_recent_news(feed_urls, hours: int = 48, max_items: int = 25, seen=None, sorted_by_date: bool = False):
+    """
+    With a `seen` index (news_index), only entries not seen on earlier runs are returned,
+    and they are recorded in the index before returning.
+    sorted_by_date: feeds are newest-first, so reading stops at the first entry past the cutoff.
+    """
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
     items = []
 
     for url in feed_urls:
-        feed = feedparser.parse(url)
-        for entry in feed.entries[:max_items]:
-            dt = _parse_time(entry)
+        entries = read_entries(url, max_items, cutoff=cutoff, sorted_by_date=sorted_by_date)
+        new = 0
+        for entry in entries:
+            dt = entry["time"]
             if dt and dt < cutoff:
                 continue
-            title = getattr(entry, "title", "") or ""
-            link = getattr(entry, "link", "") or ""
-            summary = getattr(entry, "summary", "") or ""
-            items.append({"time": dt, "title": title, "link": link, "summary": summary, "source": url})
+            title, link = entry["title"], entry["link"]
+            if seen is not None:
+                key = news_index.item_key(entry["id"], link, title)
+                if news_index.is_seen(seen, key):
+                    continue
+            item = {"time": dt, "title": title, "link": link, "summary": entry["summary"], "source": url}
+            if seen is not None:
+                item["key"] = key
+                news_index.remember(seen, key, url, item)
+                new += 1
+            items.append(item)
+        if seen is not None:
+            news_index.record_poll(seen, url, entries=len(entries), new=new)
 
     return items
 
 
-def detect_bad_news(items):
-    bad_terms = [
-        "bank", "insolv", "default", "credit event", "liquidity",
-        "layoff", "job cuts", "recession", "downgrade", "guidance cut",
-        "missed expectations", "delinquen", "foreclosure", "bankrupt",
-        "run on", "stress", "bailout"
-    ]
+def bad_news_score(item) -> int:
+    text = f"{item['title']} {item.get('summary', '')}".lower()
+    return sum(1 for k in BAD_TERMS if k in text)
+
+
+def detect_bad_news(items, dedupe: bool = True):
+    # Syndicated copies of one story across feeds collapse to a single candidate
+    if dedupe:
+        items = collapse_duplicates(items)
 
     hits = []
     for it in items:
-        text = f"{it['title']} {it['summary']}".lower()
-        score = sum(1 for k in bad_terms if k in text)
+        # Items replayed from the seen index carry their score from the run that first saw them
+        score = it["bad_score"] if "bad_score" in it else bad_news_score(it)
         if score >= 2:  # threshold reduces noise
-            hits.append({"title": it["title"], "link": it["link"], "score": score})
+            hits.append({
+                "title": it["title"],
+                "link": it["link"],
+                "score": score,
+                "new": it.get("new", True),
+                "duplicates": it.get("duplicates", 0),
+            })
 
-    return hits[:6]  # keep email tight
+    # Unreported stories first, then strongest (stable, so feed order breaks ties).
+    # Every new hit is kept: it is marked seen already, so cutting it here would lose it for good.
+    hits.sort(key=lambda h: (not h["new"], -h["score"]))
+    new = [h for h in hits if h["new"]]
+    return new + [h for h in hits if not h["new"]][:max(0, MAX_HITS - len(new))]
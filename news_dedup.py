@@ -0,0 +1,122 @@
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+
+# 20 bands x 3 rows: pairs at ~0.5 Jaccard become candidates ~93% of the time,
+# pairs at ~0.2 only ~15%; candidates are then verified on the full signature.
+NUM_PERM = 60
+BANDS = 20
+ROWS = NUM_PERM // BANDS
+
+SHINGLE_CHARS = 5
+SUMMARY_CHARS = 200  # syndicated copies often diverge after the lede
+
+_rng = np.random.default_rng(20240207)
+# Multiply-shift hashing: ((a * x + b) mod 2^64) >> 32, a odd
+_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[^a-z0-9 ]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(item) -> str:
+    summary = _TAG_RE.sub(" ", item.get("summary", "") or "")[:SUMMARY_CHARS]
+    text = f"{item.get('title', '')} {summary}".lower()
+    text = _NON_WORD_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _shingles(text: str) -> np.ndarray:
+    if len(text) <= SHINGLE_CHARS:
+        grams = {text}
+    else:
+        grams = {text[i:i + SHINGLE_CHARS] for i in range(len(text) - SHINGLE_CHARS + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash_signature(item) -> np.ndarray:
+    x = _shingles(_normalize(item))
+    with np.errstate(over="ignore"):
+        h = (x[:, None] * _A[None, :] + _B[None, :]) >> np.uint64(32)
+    return h.min(axis=0)
+
+
+def signature_hex(sig: np.ndarray) -> str:
+    # Values are < 2^32 (see the >> 32 above), so 8 hex digits each
+    return sig.astype(">u4").tobytes().hex()
+
+
+def item_signature(item) -> np.ndarray:
+    """
+    The item's cached signature (signature_hex, stored as "minhash" on its seen-index record)
+    if it has one, so items replayed from the index cluster on the title + lede they were
+    first seen with rather than on the title alone.
+    """
+    cached = item.get("minhash")
+    if cached:
+        return np.frombuffer(bytes.fromhex(cached), dtype=">u4").astype(np.uint64)
+    return minhash_signature(item)
+
+
+def cluster_items(items, threshold: float = 0.5):
+    """
+    Groups near-duplicate items (estimated Jaccard >= threshold on shingled title + lede).
+    Returns clusters as lists of item indices, ordered by each cluster's first item.
+    """
+    if not items:
+        return []
+
+    sigs = np.vstack([item_signature(it) for it in items])
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for b in range(BANDS):
+        buckets = defaultdict(list)
+        band = sigs[:, b * ROWS:(b + 1) * ROWS]
+        for i in range(len(items)):
+            buckets[band[i].tobytes()].append(i)
+
+        for members in buckets.values():
+            for j in members[1:]:
+                i = members[0]
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                if float(np.mean(sigs[i] == sigs[j])) >= threshold:
+                    ri, rj = find(i), find(j)
+                    if ri != rj:
+                        parent[max(ri, rj)] = min(ri, rj)
+
+    clusters = defaultdict(list)
+    for i in range(len(items)):
+        clusters[find(i)].append(i)
+    return [clusters[r] for r in sorted(clusters)]
+
+
+def collapse_duplicates(items, threshold: float = 0.5):
+    """
+    One representative per near-duplicate cluster (the earliest item), annotated with
+    how many copies were folded into it and which feeds carried them.
+    A cluster only counts as new if none of its copies were seen before.
+    """
+    out = []
+    for members in cluster_items(items, threshold=threshold):
+        rep = dict(items[members[0]])
+        copies = [items[i] for i in members]
+        rep["duplicates"] = len(members) - 1
+        rep["sources"] = sorted({c.get("source", "") for c in copies if c.get("source")})
+        if any("new" in c for c in copies):
+            rep["new"] = all(c.get("new", True) for c in copies)
+        out.append(rep)
+    return out
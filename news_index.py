@@ -0,0 +1,105 @@
+import hashlib
+import json
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+
+# Separate indexes so the same feed can be streamed independently by each consumer
+NEWS_SEEN_PATH = Path("state/news_seen.json")
+POLICY_SEEN_PATH = Path("state/policy_seen.json")
+
+# Keep keys well past the 48h scoring window so old entries are never re-treated as new
+RETENTION_HOURS = 24 * 7
+
+# Smoothing for the per-feed "new items per poll" aggregate
+EWM_ALPHA = 0.2
+
+
+def load_index(path: Path):
+    if not path.exists():
+        return {"items": {}, "feeds": {}}
+    return json.loads(path.read_text())
+
+
+def save_index(index, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(index, indent=1))
+
+
+def item_key(guid: str = "", link: str = "", title: str = "") -> str:
+    """
+    Stable key for a feed entry: GUID if the feed provides one, else link, else title.
+    """
+    basis = guid or link or title
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()[:16]
+
+
+def is_seen(index, key: str) -> bool:
+    return key in index["items"]
+
+
+def remember(index, key: str, feed: str, item: dict, now: datetime = None):
+    now = now or datetime.now(timezone.utc)
+    t = item.get("time")
+    index["items"][key] = {
+        "feed": feed,
+        "first_seen": now.isoformat(),
+        "time": t.isoformat() if t else None,
+        "title": item.get("title", ""),
+        "link": item.get("link", ""),
+    }
+
+
+def annotate(index, key: str, **fields):
+    """
+    Caches per-item scores (and dedup signatures) so later runs reuse them instead of recomputing.
+    """
+    index["items"][key].update(fields)
+
+
+def record_poll(index, feed: str, entries: int, new: int, now: datetime = None):
+    now = now or datetime.now(timezone.utc)
+    agg = index["feeds"].setdefault(feed, {
+        "polls": 0,
+        "entries_total": 0,
+        "new_total": 0,
+        "new_per_poll_ewm": None,
+    })
+    agg["polls"] += 1
+    agg["entries_total"] += entries
+    agg["new_total"] += new
+    agg["last_poll"] = now.isoformat()
+    agg["last_new"] = new
+    prev = agg["new_per_poll_ewm"]
+    agg["new_per_poll_ewm"] = new if prev is None else EWM_ALPHA * new + (1 - EWM_ALPHA) * prev
+
+
+def evict(index, now: datetime = None, max_age_hours: int = RETENTION_HOURS) -> int:
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(hours=max_age_hours)).isoformat()
+    stale = [k for k, v in index["items"].items() if v["first_seen"] < cutoff]
+    for k in stale:
+        del index["items"][k]
+    return len(stale)
+
+
+def window(index, hours: int = 48, feeds=None, now: datetime = None):
+    """
+    Items from the index that fall inside the last `hours`, with `time` parsed back to datetime.
+    Undated entries count from when they were first seen.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(hours=hours)
+
+    out = []
+    for key, rec in index["items"].items():
+        if feeds is not None and rec["feed"] not in feeds:
+            continue
+        t = datetime.fromisoformat(rec["time"]) if rec.get("time") else None
+        ref = t or datetime.fromisoformat(rec["first_seen"])
+        if ref < cutoff:
+            continue
+        out.append({**rec, "key": key, "time": t, "source": rec["feed"]})
+
+    # Insertion order == feed order, then entry order within each poll
+    return out
@@ -1,52 +1,68 @@
-import feedparser
 from datetime import datetime, timezone, timedelta
 
+import news_index
+from feed_stream import read_entries
 
-def _parse_time(entry):
-    # feedparser may provide: published_parsed or updated_parsed
-    t = getattr(entry, "published_parsed", None) or getattr(entry, "updated_parsed", None)
-    if not t:
-        return None
-    return datetime(*t[:6], tzinfo=timezone.utc)
 
-
-def fetch_recent_feed_items(feed_url: str, hours: int = 48, max_items: int = 20):
-    feed = feedparser.parse(feed_url)
+def fetch_recent_feed_items(feed_url: str, hours: int = 48, max_items: int = 20, seen=None,
+                            sorted_by_date: bool = False):
+    """
+    With a `seen` index (news_index), only entries not seen on earlier runs are returned.
+    sorted_by_date: the feed is newest-first, so reading stops at the first entry past the cutoff.
+    """
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
 
+    entries = read_entries(feed_url, max_items, cutoff=cutoff, sorted_by_date=sorted_by_date)
     items = []
-    for entry in feed.entries[:max_items]:
-        dt = _parse_time(entry)
+    for entry in entries:
+        dt = entry["time"]
         if dt and dt < cutoff:
             continue
-        title = getattr(entry, "title", "") or ""
-        link = getattr(entry, "link", "") or ""
-        summary = getattr(entry, "summary", "") or ""
-        items.append({"time": dt, "title": title, "link": link, "summary": summary})
+        title, link = entry["title"], entry["link"]
+        if seen is not None:
+            key = news_index.item_key(entry["id"], link, title)
+            if news_index.is_seen(seen, key):
+                continue
+        item = {"time": dt, "title": title, "link": link, "summary": entry["summary"]}
+        if seen is not None:
+            item["key"] = key
+            news_index.remember(seen, key, feed_url, item)
+        items.append(item)
+    if seen is not None:
+        news_index.record_poll(seen, feed_url, entries=len(entries), new=len(items))
     return items
 
 
-def score_policy_items(items):
-    # Very simple keyword scoring
-    dovish = [
-        "financial stability", "liquidity", "facility", "backstop", "support",
-        "market functioning", "guarantee", "temporary measure", "provide liquidity",
-        "standing repo", "swap line"
-    ]
-    hawkish = [
-        "restrictive", "higher for longer", "inflation remains", "tightening",
-        "raise rates", "rate increase", "reduce balance sheet", "quantitative tightening",
-        "inflation is too high"
-    ]
+# Very simple keyword scoring
+DOVISH_TERMS = [
+    "financial stability", "liquidity", "facility", "backstop", "support",
+    "market functioning", "guarantee", "temporary measure", "provide liquidity",
+    "standing repo", "swap line"
+]
+HAWKISH_TERMS = [
+    "restrictive", "higher for longer", "inflation remains", "tightening",
+    "raise rates", "rate increase", "reduce balance sheet", "quantitative tightening",
+    "inflation is too high"
+]
+
+
+def policy_item_scores(item):
+    text = f"{item['title']} {item.get('summary', '')}".lower()
+    d = sum(1 for k in DOVISH_TERMS if k in text)
+    h = sum(1 for k in HAWKISH_TERMS if k in text)
+    return d, h
 
+
+def score_policy_items(items):
     score = 0
     hits = []
 
     for it in items:
-        text = f"{it['title']} {it['summary']}".lower()
-
-        d = sum(1 for k in dovish if k in text)
-        h = sum(1 for k in hawkish if k in text)
+        # Items replayed from the seen index carry their scores from the run that first saw them
+        if "dovish" in it:
+            d, h = it["dovish"], it["hawkish"]
+        else:
+            d, h = policy_item_scores(it)
 
         score += (d - h)
         if d or h:
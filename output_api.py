@@ -0,0 +1,171 @@
+import bisect
+import hashlib
+import json
+import math
+import os
+from datetime import date, datetime, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from config import OUTPUT_DIR
+
+
+OUTPUT_PATH = Path(OUTPUT_DIR)
+LATEST_FILE = "latest.json"
+RUNS_FILE = "runs.ndjson"
+INDEX_FILE = "runs.idx.json"  # [[seq, byte offset], ...] so "since N" seeks instead of scanning
+
+CACHE_SECONDS = 300  # runs land twice a day; clients may reuse a response for 5 minutes
+
+
+def to_jsonable(obj):
+    """
+    Plain-JSON version of results/meta: numpy scalars unwrapped, NaN/inf -> null,
+    timestamps -> ISO strings, dict keys -> strings.
+    """
+    if isinstance(obj, dict):
+        return {str(k): to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(v) for v in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, (datetime, date, pd.Timestamp)):
+        return obj.isoformat()
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return obj
+    return str(obj)
+
+
+def _load_index(root: Path) -> list:
+    path = root / INDEX_FILE
+    return json.loads(path.read_text()) if path.exists() else []
+
+
+def write_run_output(results: dict, run_id: str, now_et: str, root: Path = None) -> int:
+    """
+    Publishes one run: appended to runs.ndjson and written as latest.json.
+    Returns the run's sequence number (1-based, monotonic).
+    """
+    root = Path(root) if root is not None else OUTPUT_PATH
+    root.mkdir(parents=True, exist_ok=True)
+
+    index = _load_index(root)
+    seq = index[-1][0] + 1 if index else 1
+    record = {
+        "seq": seq,
+        "run_id": run_id,
+        "now_et": now_et,
+        "published": datetime.now(timezone.utc).isoformat(),
+        "results": to_jsonable({k: v for k, v in results.items() if k != "meta"}),
+        "meta": to_jsonable(results.get("meta") or {}),
+    }
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+    runs_path = root / RUNS_FILE
+    with open(runs_path, "ab") as fh:
+        offset = fh.tell()
+        fh.write(line)
+
+    index.append([seq, offset])
+    for name, text in ((INDEX_FILE, json.dumps(index)), (LATEST_FILE, json.dumps(record, indent=2))):
+        tmp = root / f"{name}.{os.getpid()}.tmp"
+        tmp.write_text(text)
+        os.replace(tmp, root / name)
+    return seq
+
+
+def read_since(since: int, root: Path = None):
+    """
+    NDJSON bytes for every run with seq > since, and the latest seq.
+    """
+    root = Path(root) if root is not None else OUTPUT_PATH
+    index = _load_index(root)
+    if not index:
+        return b"", 0
+    last_seq = index[-1][0]
+    pos = bisect.bisect_right([s for s, _ in index], since)
+    if pos >= len(index):
+        return b"", last_seq
+    with open(root / RUNS_FILE, "rb") as fh:
+        fh.seek(index[pos][1])
+        return fh.read(), last_seq
+
+
+class OutputHandler(BaseHTTPRequestHandler):
+    """
+    GET /latest            -> latest run as JSON
+    GET /runs?since=N      -> NDJSON of runs with seq > N (X-Last-Seq tells the client where to resume)
+    Both honour If-None-Match with ETag + Cache-Control so polling is cheap.
+    """
+    root = OUTPUT_PATH
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", etag: str = None,
+              last_modified: float = None, extra: dict = None):
+        self.send_response(status)
+        self.send_header("Cache-Control", f"public, max-age={CACHE_SECONDS}")
+        if etag:
+            self.send_header("ETag", etag)
+        if last_modified:
+            self.send_header("Last-Modified", format_datetime(datetime.fromtimestamp(last_modified, timezone.utc), usegmt=True))
+        for k, v in (extra or {}).items():
+            self.send_header(k, str(v))
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304 and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _not_modified(self, etag: str) -> bool:
+        return etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        latest = self.root / LATEST_FILE
+
+        if url.path == "/latest":
+            if not latest.exists():
+                return self._send(404, b'{"error":"no runs yet"}')
+            body = latest.read_bytes()
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            if self._not_modified(etag):
+                return self._send(304, etag=etag)
+            return self._send(200, body, etag=etag, last_modified=latest.stat().st_mtime)
+
+        if url.path == "/runs":
+            try:
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+            except ValueError:
+                return self._send(400, b'{"error":"since must be an integer"}')
+            body, last_seq = read_since(since, root=self.root)
+            etag = f'"{since}-{last_seq}"'
+            if self._not_modified(etag):
+                return self._send(304, etag=etag, extra={"X-Last-Seq": last_seq})
+            return self._send(200, body, content_type="application/x-ndjson", etag=etag,
+                              extra={"X-Last-Seq": last_seq})
+
+        return self._send(404, b'{"error":"not found"}')
+
+    do_HEAD = do_GET
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, root: Path = None):
+    handler = type("Handler", (OutputHandler,), {"root": Path(root) if root is not None else OUTPUT_PATH})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Serving dashboard output on http://{host}:{port} (/latest, /runs?since=N)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,233 @@
+import fcntl
+import json
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import PRICE_STORE_DIR
+
+
+STORE_PATH = Path(PRICE_STORE_DIR)
+
+DATES_FILE = "_dates.npy"
+WRITTEN_FILE = "_written.json"  # key -> UTC time of the fetch that last wrote it
+LOCK_FILE = ".lock"
+# Relative gap between stored and re-fetched values that counts as a re-adjustment, not CSV noise
+RESCALE_TOLERANCE = 1e-6
+CURRENT_FILE = "CURRENT"  # name of the generation directory readers should use
+GEN_PREFIX = "gen-"
+
+
+def _key_file(key: str) -> str:
+    # Tickers/series ids like "XIC.TO", "BTC-USD", "BD.CDN.10YR.DQ.YLD" are kept readable
+    return re.sub(r"[^A-Za-z0-9._-]", "_", key) + ".npy"
+
+
+@contextmanager
+def _write_lock(root: Path):
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / LOCK_FILE, "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _atomic_save(path: Path, arr: np.ndarray):
+    # Write-then-rename so readers holding an old mmap keep a consistent inode
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        np.save(fh, arr)
+    os.replace(tmp, path)
+
+
+def _generation(root: Path) -> Path:
+    """
+    Directory holding the current columns + date index. A store written before
+    generations existed keeps its files directly in `root` until its next re-layout.
+    """
+    current = root / CURRENT_FILE
+    if current.exists():
+        return root / current.read_text().strip()
+    return root
+
+
+def _switch_generation(root: Path, gen: Path):
+    tmp = root / f"{CURRENT_FILE}.{os.getpid()}.tmp"
+    tmp.write_text(gen.name)
+    os.replace(tmp, root / CURRENT_FILE)
+
+
+def _cleanup(root: Path, keep: set):
+    # The previous generation is kept so a reader that just resolved CURRENT can still open it
+    for path in root.glob(GEN_PREFIX + "*"):
+        if path.name not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+    if root.name not in keep:
+        for path in root.glob("*.npy"):  # pre-generation layout
+            path.unlink()
+
+
+def _load_dates(root: Path) -> np.ndarray:
+    path = root / DATES_FILE
+    if not path.exists():
+        return np.empty(0, dtype="datetime64[ns]")
+    return np.load(path, mmap_mode="r")
+
+
+def _to_datetime64(index) -> np.ndarray:
+    idx = pd.DatetimeIndex(index)
+    if idx.tz is not None:
+        idx = idx.tz_convert("UTC").tz_localize(None)
+    return idx.normalize().values.astype("datetime64[ns]")
+
+
+def _merge(col: np.ndarray, dates: np.ndarray, new_dates: np.ndarray, new_values: np.ndarray, rescale_history: bool):
+    """
+    Writes the new window into `col` in place. With rescale_history, stored values older than
+    the window are first scaled by new/old at the earliest overlapping date, so a series the
+    source re-adjusts back through history (dividends, splits) stays continuous at the seam.
+    """
+    pos = np.searchsorted(dates, new_dates)
+    if rescale_history:
+        old = col[pos]
+        both = np.flatnonzero(~np.isnan(old) & (old != 0))
+        if len(both):
+            i = both[0]
+            ratio = new_values[i] / old[i]
+            if np.isfinite(ratio) and abs(ratio - 1.0) > RESCALE_TOLERANCE:
+                col[:pos.min()] *= ratio
+    col[pos] = new_values
+
+
+def write_series(key: str, series: pd.Series, root: Path = None, rescale_history: bool = False):
+    """
+    Merges a date-indexed series into the store under `key`.
+    Existing observations outside the new series are kept, overlapping dates are overwritten.
+    rescale_history: the source back-adjusts its whole history (Yahoo Adj Close), so older
+    stored values are rescaled to match the new window instead of leaving a step at its edge.
+    """
+    root = Path(root) if root is not None else STORE_PATH
+    s = pd.to_numeric(series, errors="coerce").dropna().sort_index()
+    if s.empty:
+        return
+
+    new_dates = _to_datetime64(s.index)
+    new_values = s.to_numpy(dtype="float64")
+
+    with _write_lock(root):
+        gen = _generation(root)
+        old_dates = np.array(_load_dates(gen))
+        dates = np.union1d(old_dates, new_dates)
+        path = gen / _key_file(key)
+
+        if len(dates) == len(old_dates):
+            # Same index: only this column changes, and a single rename is atomic
+            col = np.array(np.load(path)) if path.exists() else np.full(len(dates), np.nan)
+            if len(col) != len(dates):
+                col = np.full(len(dates), np.nan)  # left out of step by an older crash
+            _merge(col, dates, new_dates, new_values, rescale_history)
+            _atomic_save(path, col)
+        else:
+            # Re-layout every column onto the widened index in a fresh generation directory,
+            # then switch CURRENT; a crash part-way leaves the old generation untouched.
+            n = int(gen.name[len(GEN_PREFIX):]) + 1 if gen.name.startswith(GEN_PREFIX) else 1
+            new_gen = root / f"{GEN_PREFIX}{n}"
+            shutil.rmtree(new_gen, ignore_errors=True)
+            new_gen.mkdir(parents=True)
+
+            pos = np.searchsorted(dates, old_dates)
+            for old_path in gen.glob("*.npy"):
+                if old_path.name == DATES_FILE or old_path.name == path.name:
+                    continue
+                old = np.load(old_path)
+                if len(old) != len(old_dates):
+                    continue  # unusable column; its fetcher will simply re-download it
+                col = np.full(len(dates), np.nan)
+                col[pos] = old
+                np.save(new_gen / old_path.name, col)
+
+            col = np.full(len(dates), np.nan)
+            if path.exists():
+                old = np.load(path)
+                if len(old) == len(old_dates):
+                    col[pos] = old
+            _merge(col, dates, new_dates, new_values, rescale_history)
+            np.save(new_gen / path.name, col)
+            np.save(new_gen / DATES_FILE, dates)
+
+            _switch_generation(root, new_gen)
+            _cleanup(root, keep={new_gen.name, gen.name})
+
+        written_path = root / WRITTEN_FILE
+        written = json.loads(written_path.read_text()) if written_path.exists() else {}
+        written[key] = datetime.now(timezone.utc).isoformat()
+        tmp = written_path.with_name(written_path.name + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(written, indent=1))
+        os.replace(tmp, written_path)
+
+
+def read_column(key: str, root: Path = None):
+    """
+    Returns zero-copy (dates, values) memory-mapped views for `key`.
+    Values are NaN on shared-index dates the source has no observation for.
+    """
+    gen = _generation(Path(root) if root is not None else STORE_PATH)
+    path = gen / _key_file(key)
+    if not path.exists():
+        raise KeyError(f"{key} not in price store")
+
+    dates = _load_dates(gen)
+    values = np.load(path, mmap_mode="r")
+    if len(values) != len(dates):
+        raise RuntimeError(f"Price store column {key} is out of step with the date index")
+    return dates, values
+
+
+def read_series(key: str, root: Path = None) -> pd.Series:
+    """
+    Wraps the memory-mapped column in a pandas Series without copying.
+    Call .dropna() on the result to get the source's own observation dates.
+    """
+    dates, values = read_column(key, root=root)
+    return pd.Series(values, index=pd.DatetimeIndex(dates), name=key, copy=False)
+
+
+def last_observation(key: str, root: Path = None):
+    """
+    Returns the date of the latest non-NaN value for `key`, or None if not stored.
+    """
+    try:
+        dates, values = read_column(key, root=root)
+    except (KeyError, RuntimeError):
+        return None  # an unusable column just means "fetch it"
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid):
+        return None
+    return pd.Timestamp(dates[valid[-1]])
+
+
+def last_write(key: str, root: Path = None):
+    """
+    UTC datetime of the fetch that last wrote `key`, or None.
+    """
+    root = Path(root) if root is not None else STORE_PATH
+    path = root / WRITTEN_FILE
+    if not path.exists():
+        return None
+    ts = json.loads(path.read_text()).get(key)
+    return datetime.fromisoformat(ts) if ts else None
+
+
+def keys(root: Path = None) -> list:
+    root = Path(root) if root is not None else STORE_PATH
+    if not root.exists():
+        return []
+    return sorted(p.name[:-4] for p in _generation(root).glob("*.npy") if p.name != DATES_FILE)
@@ -0,0 +1,168 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from config import PROVENANCE_DIR
+
+
+PROVENANCE_PATH = Path(PROVENANCE_DIR)
+
+
+def new_run_id(now: datetime = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    return now.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _json_default(o):
+    if isinstance(o, (datetime, date, pd.Timestamp)):
+        return o.isoformat()
+    return str(o)
+
+
+def encode_input(value):
+    """
+    Serializes one pipeline input deterministically, so identical inputs hash identically.
+    Returns (payload bytes, kind).
+    """
+    if value is None:
+        return b"", "none"
+    if isinstance(value, pd.Series):
+        buf = io.StringIO()
+        value.to_csv(buf, header=True, date_format="%Y-%m-%d")
+        return buf.getvalue().encode("utf-8"), "series"
+    return json.dumps(value, default=_json_default, sort_keys=True).encode("utf-8"), "json"
+
+
+def _series_chunks(value: pd.Series):
+    """
+    Splits a series into one headerless CSV chunk per calendar month, in time order.
+    Daily windows shift by a day per run, so only the first and last month change and
+    every month in between hashes to a blob that is already stored.
+    """
+    if not isinstance(value.index, pd.DatetimeIndex) or value.empty:
+        payload, _ = encode_input(value)
+        return [payload], True
+    value = value.sort_index()
+    months = value.index.strftime("%Y-%m")
+    chunks = []
+    for month in pd.unique(months):
+        buf = io.StringIO()
+        value[months == month].to_csv(buf, header=False, date_format="%Y-%m-%d")
+        chunks.append(buf.getvalue().encode("utf-8"))
+    return chunks, False
+
+
+def put_input(value, root: Path = None) -> dict:
+    """
+    Stores one input and returns its manifest entry. Series are stored as monthly chunks.
+    """
+    if isinstance(value, pd.Series):
+        chunks, whole = _series_chunks(value)
+        if not whole:
+            return {
+                "kind": "series_chunks",
+                "name": None if value.name is None else str(value.name),
+                "index_name": value.index.name,
+                "chunks": [put_blob(c, root) for c in chunks],
+                "bytes": sum(len(c) for c in chunks),
+            }
+    payload, kind = encode_input(value)
+    return {"sha256": put_blob(payload, root), "kind": kind, "bytes": len(payload)}
+
+
+def get_input(ref: dict, root: Path = None):
+    if ref["kind"] != "series_chunks":
+        return decode_input(get_blob(ref["sha256"], root), ref["kind"])
+    payload = b"".join(get_blob(d, root) for d in ref["chunks"])
+    df = pd.read_csv(io.BytesIO(payload), header=None, index_col=0, parse_dates=[0])
+    s = df.iloc[:, 0]
+    s.name = ref["name"]
+    s.index.name = ref["index_name"]
+    return s
+
+
+def decode_input(payload: bytes, kind: str):
+    if kind == "none":
+        return None
+    if kind == "series":
+        df = pd.read_csv(io.BytesIO(payload), index_col=0, parse_dates=[0])
+        return df.iloc[:, 0]
+    return json.loads(payload.decode("utf-8"))
+
+
+def _blob_path(root: Path, digest: str) -> Path:
+    return root / "objects" / digest[:2] / f"{digest}.gz"
+
+
+def put_blob(payload: bytes, root: Path = None) -> str:
+    """
+    Stores payload under its SHA-256; unchanged inputs (or series months) cost nothing extra.
+    """
+    root = Path(root) if root is not None else PROVENANCE_PATH
+    digest = hashlib.sha256(payload).hexdigest()
+    path = _blob_path(root, digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        # mtime=0 keeps the compressed bytes stable for identical payloads
+        tmp.write_bytes(gzip.compress(payload, mtime=0))
+        os.replace(tmp, path)
+    return digest
+
+
+def get_blob(digest: str, root: Path = None) -> bytes:
+    root = Path(root) if root is not None else PROVENANCE_PATH
+    payload = gzip.decompress(_blob_path(root, digest).read_bytes())
+    if hashlib.sha256(payload).hexdigest() != digest:
+        raise RuntimeError(f"Provenance blob {digest} is corrupt")
+    return payload
+
+
+def record_run(run_id: str, now_et: str, inputs: dict, prior_state: dict, root: Path = None) -> Path:
+    """
+    Writes the run's manifest: every input by content hash, plus the run history as it was
+    before this run (persistence flags and the history bar depend on it).
+    """
+    root = Path(root) if root is not None else PROVENANCE_PATH
+    manifest = {
+        "run_id": run_id,
+        "now_et": now_et,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "inputs": {},
+    }
+    for name, value in inputs.items():
+        manifest["inputs"][name] = put_input(value, root)
+
+    payload, _ = encode_input(prior_state)
+    manifest["prior_state"] = put_blob(payload, root)
+
+    path = root / "runs" / f"{run_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2))
+    return path
+
+
+def load_run(run_id: str, root: Path = None):
+    """
+    Returns (manifest, inputs, prior_state) for a recorded run, entirely from local storage.
+    """
+    root = Path(root) if root is not None else PROVENANCE_PATH
+    path = root / "runs" / f"{run_id}.json"
+    if not path.exists():
+        raise FileNotFoundError(f"No provenance manifest for run {run_id} ({path})")
+    manifest = json.loads(path.read_text())
+
+    inputs = {name: get_input(ref, root) for name, ref in manifest["inputs"].items()}
+    prior_state = json.loads(get_blob(manifest["prior_state"], root).decode("utf-8"))
+    return manifest, inputs, prior_state
+
+
+def list_runs(root: Path = None) -> list:
+    root = Path(root) if root is not None else PROVENANCE_PATH
+    return sorted(p.stem for p in (root / "runs").glob("*.json"))
@@ -0,0 +1,180 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+# name -> fetch() ; each input is fetched once and shared by every indicator that declares it
+INPUTS = {}
+
+# group name -> fetch(names) returning {name: value}; one call serves several inputs
+INPUT_GROUPS = {}
+
+# name -> spec ; insertion order is the display order in the email
+INDICATORS = {}
+
+# Timeouts run from when a job starts, not from submission, so queueing never counts against it
+MAX_WORKERS = 16
+DEFAULT_TIMEOUT = 60.0  # seconds per input fetch / indicator compute
+
+
+def register_input(name: str, fetch, timeout: float = DEFAULT_TIMEOUT, with_errors: bool = False):
+    """
+    with_errors: fetch takes the run's errors list, for fetchers that recover from a failure
+    (e.g. by serving a stored copy) but should still report it.
+    """
+    INPUTS[name] = {"fetch": fetch, "timeout": timeout, "with_errors": with_errors}
+
+
+def register_input_group(group: str, names: list, fetch, timeout: float = DEFAULT_TIMEOUT):
+    """
+    Inputs that are cheaper to fetch together (e.g. one batched download for many tickers).
+    fetch(names, errors) gets the members that are needed this run and returns {name: value};
+    members missing from the result count as failed fetches.
+    """
+    INPUT_GROUPS[group] = {"fetch": fetch, "timeout": timeout}
+    for name in names:
+        INPUTS[name] = {"group": group, "timeout": timeout}
+
+
+def register_indicator(name: str, label: str, inputs: list, compute, commentary: dict = None,
+                       timeout: float = DEFAULT_TIMEOUT):
+    """
+    compute(*inputs) must return a dict with at least "combined" (RED/YELLOW/GREEN).
+    commentary maps a status to the non-directive line(s) shown in the email.
+    """
+    INDICATORS[name] = {
+        "name": name,
+        "label": label,
+        "inputs": list(inputs),
+        "compute": compute,
+        "commentary": commentary or {},
+        "timeout": timeout,
+    }
+
+
+def _run_pool(jobs: dict, max_workers: int):
+    """
+    jobs: name -> (fn, args, timeout). Returns name -> (ok, value_or_exc, elapsed).
+    Each job's timeout counts from when a worker picks it up. Timed-out jobs are abandoned
+    (threads can't be killed) and reported as TimeoutError; a job still queued once the
+    longest timeout has passed since submission (every worker stuck) is reported the same way.
+    """
+    started, elapsed = {}, {}
+
+    def _timed(name, fn, *args):
+        started[name] = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            # Recorded when the job ends, not when the collector below gets around to it
+            elapsed[name] = time.perf_counter() - started[name]
+
+    out = {}
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        submitted = time.perf_counter()
+        queue_limit = submitted + max((t for _, _, t in jobs.values()), default=0.0)
+        futures = {name: pool.submit(_timed, name, fn, *args) for name, (fn, args, _) in jobs.items()}
+        for name, fut in futures.items():
+            timeout = jobs[name][2]
+            while True:
+                now = time.perf_counter()
+                begun = started.get(name)
+                if begun is None and now >= queue_limit:
+                    fut.cancel()
+                    out[name] = (False, TimeoutError(f"never started within {queue_limit - submitted:.0f}s"), 0.0)
+                    break
+                # Until the job starts its deadline isn't known; check back shortly
+                wait = max(0.0, begun + timeout - now) if begun is not None else min(0.1, queue_limit - now)
+                try:
+                    value = fut.result(timeout=wait)
+                    out[name] = (True, value, elapsed[name])
+                except FutureTimeout:
+                    if begun is None:
+                        continue
+                    out[name] = (False, TimeoutError(f"exceeded {timeout:.0f}s"), time.perf_counter() - begun)
+                except Exception as e:
+                    out[name] = (False, e, elapsed.get(name, 0.0))
+                break
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return out
+
+
+def needed_inputs(names=None) -> list:
+    names = names if names is not None else list(INDICATORS)
+    seen = []
+    for n in names:
+        for i in INDICATORS[n]["inputs"]:
+            if i not in seen:
+                seen.append(i)
+    return seen
+
+
+def fetch_inputs(names=None, errors: list = None, max_workers: int = MAX_WORKERS):
+    """
+    Fetches the inputs the registered indicators need, concurrently.
+    A failed fetch yields None (indicators already treat missing series as insufficient data).
+    Returns (inputs, timings).
+    """
+    errors = errors if errors is not None else []
+    names = names if names is not None else needed_inputs()
+
+    jobs, members = {}, {}
+    for n in names:
+        group = INPUTS[n].get("group")
+        if group is None:
+            args = (errors,) if INPUTS[n].get("with_errors") else ()
+            jobs[n] = (INPUTS[n]["fetch"], args, INPUTS[n]["timeout"])
+        else:
+            members.setdefault(group, []).append(n)
+    for group, group_names in members.items():
+        spec = INPUT_GROUPS[group]
+        jobs[group] = (spec["fetch"], (group_names, errors), spec["timeout"])
+
+    inputs, timings = {}, {}
+    for job, (ok, value, elapsed) in _run_pool(jobs, max_workers).items():
+        for name in members.get(job, [job]):
+            timings[name] = elapsed
+            if ok and job in members and name not in value:
+                errors.append(f"{name} fetch failed: no data in {job} batch")
+                inputs[name] = None
+            elif ok:
+                inputs[name] = value[name] if job in members else value
+            else:
+                errors.append(f"{name} fetch failed: {type(value).__name__}: {value}")
+                inputs[name] = None
+    return {n: inputs[n] for n in names}, timings
+
+
+def evaluate(inputs: dict, errors: list = None, max_workers: int = MAX_WORKERS):
+    """
+    Computes every registered indicator from already-fetched inputs, concurrently.
+    Failures and timeouts fall back to a YELLOW placeholder. Returns (results, timings).
+    """
+    errors = errors if errors is not None else []
+    jobs = {
+        name: (spec["compute"], tuple(inputs.get(i) for i in spec["inputs"]), spec["timeout"])
+        for name, spec in INDICATORS.items()
+    }
+
+    results, timings = {}, {}
+    for name, (ok, value, elapsed) in _run_pool(jobs, max_workers).items():
+        timings[name] = elapsed
+        if ok:
+            results[name] = value
+        else:
+            kind = "timeout" if isinstance(value, TimeoutError) else "failed"
+            errors.append(f"{name} calc {kind}: {type(value).__name__}: {value}")
+            results[name] = {"combined": "YELLOW", "reason": f"{name}_{kind}"}
+    return results, timings
+
+
+def commentary_lines(results: dict) -> list:
+    lines = []
+    for name, spec in INDICATORS.items():
+        status = (results.get(name) or {}).get("combined", "YELLOW")
+        text = spec["commentary"].get(status) or spec["commentary"].get("YELLOW")
+        if not text:
+            continue
+        lines.extend([text] if isinstance(text, str) else text)
+    return lines
@@ -0,0 +1,174 @@
+from html import escape
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import SITE_DIR
+import registry
+
+
+SITE_PATH = Path(SITE_DIR) / "index.html"
+
+SPARK_POINTS = 120
+# Same window for every chart: FRED returns decades, Yahoo 6 months, the price store whatever it has
+SPARK_LOOKBACK = pd.DateOffset(months=6)
+SPARK_W, SPARK_H = 140, 28
+
+COLORS = {"GREEN": "#2e7d32", "YELLOW": "#f9a825", "RED": "#c62828"}
+
+
+def lttb(y, n_out: int):
+    """
+    Largest-Triangle-Three-Buckets downsampling. Returns (indices, values) of the kept points;
+    first and last points are always kept.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n), y
+
+    x = np.arange(n, dtype="float64")
+    every = (n - 2) / (n_out - 2)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        nlo, nhi = hi, min(int((i + 2) * every) + 1, n)
+        if nlo >= nhi:
+            nlo, nhi = n - 1, n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep, y[keep]
+
+
+def minmax_buckets(y, n_out: int):
+    """
+    Keeps the min and max of each of n_out/2 equal buckets (in time order).
+    Cheaper than LTTB and preserves spikes exactly.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    buckets = max(1, n_out // 2)
+    if n <= n_out:
+        return np.arange(n), y
+
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    keep = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        seg = y[lo:hi]
+        i, j = lo + int(np.argmin(seg)), lo + int(np.argmax(seg))
+        keep.extend(sorted({i, j}))
+    keep = np.asarray(keep, dtype=np.int64)
+    return keep, y[keep]
+
+
+def build_sparklines(inputs: dict, n: int = SPARK_POINTS, method=lttb, lookback=SPARK_LOOKBACK) -> dict:
+    """
+    Cuts every Series input to the last `lookback` and downsamples it once per run;
+    the result feeds both the email and the site page.
+    """
+    out = {}
+    for name, s in inputs.items():
+        if not isinstance(s, pd.Series):
+            continue
+        s = s.dropna()
+        if isinstance(s.index, pd.DatetimeIndex) and len(s):
+            s = s[s.index > s.index[-1] - lookback]
+        if len(s) < 2:
+            continue
+        _, values = method(s.to_numpy(dtype="float64"), n)
+        out[name] = {"values": values, "last": float(s.iloc[-1]), "last_date": s.index[-1]}
+    return out
+
+
+def sparkline_svg(values, width: int = SPARK_W, height: int = SPARK_H) -> str:
+    v = np.asarray(values, dtype="float64")
+    lo, hi = float(v.min()), float(v.max())
+    span = (hi - lo) or 1.0
+    xs = np.linspace(1, width - 1, len(v))
+    ys = (height - 2) - (v - lo) / span * (height - 4)
+    pts = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}"><polyline fill="none" stroke="#37474f" '
+        f'stroke-width="1.2" points="{pts}"/></svg>'
+    )
+
+
+def history_svg(runs: list, names: list, cell: int = 8) -> str:
+    """
+    One row per indicator, one column per stored run (oldest left), colored by status.
+    """
+    width, height = max(1, len(runs)) * cell, len(names) * cell
+    rects = []
+    for col, run in enumerate(runs):
+        statuses = run.get("statuses", {})
+        for row, name in enumerate(names):
+            color = COLORS.get(statuses.get(name), "#e0e0e0")
+            rects.append(f'<rect x="{col * cell}" y="{row * cell}" width="{cell - 1}" height="{cell - 1}" fill="{color}"/>')
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">{"".join(rects)}</svg>'
+    )
+
+
+def render_html(now_et: str, results: dict, sparklines: dict, runs: list) -> str:
+    meta = results.get("meta") or {}
+    names = list(registry.INDICATORS)
+
+    rows = []
+    for i, (name, spec) in enumerate(registry.INDICATORS.items(), start=1):
+        status = (results.get(name) or {}).get("combined", "YELLOW")
+        charts = []
+        for inp in spec["inputs"]:
+            sp = sparklines.get(inp)
+            if sp is None:
+                continue
+            charts.append(
+                f'<div style="display:inline-block;margin:0 8px 4px 0;font-size:11px;color:#555">'
+                f'{escape(inp)} {sp["last"]:.4g}<br>{sparkline_svg(sp["values"])}</div>'
+            )
+        rows.append(
+            f'<tr><td style="padding:4px 8px">{i}. {escape(spec["label"])}</td>'
+            f'<td style="padding:4px 8px;color:#fff;background:{COLORS.get(status, COLORS["YELLOW"])}">{status}</td>'
+            f'<td style="padding:4px 8px">{"".join(charts)}</td></tr>'
+        )
+
+    commentary = "".join(f"<li>{escape(x)}</li>" for x in registry.commentary_lines(results))
+
+    hits = [h for h in ((results.get("bad_news_reaction") or {}).get("bad_hits") or []) if h.get("new", True)]
+    news = "".join(
+        f'<li><a href="{escape(h.get("link", ""))}">{escape(h.get("title", ""))}</a></li>' for h in hits
+    )
+
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">",
+        f"<title>Deflation Dashboard — {escape(now_et)}</title></head>",
+        '<body style="font-family:Arial,Helvetica,sans-serif;color:#222">',
+        "<h2>DEFLATION → RISK-ON DASHBOARD (CAN + US)</h2>",
+        f"<p>Timestamp: {escape(now_et)}</p>",
+        f'<table style="border-collapse:collapse">{"".join(rows)}</table>',
+        f"<p><b>GREEN COUNT:</b> {meta.get('green_count', 'NA')} / {len(names)}<br>",
+        f"<b>Stand-down active:</b> {'YES' if meta.get('stand_down_active') else 'NO'}"
+        f" ({escape(str(meta.get('stand_down_reason', 'NA')))})<br>",
+        f"<b>Risk window opening (≥4 greens for 10 runs):</b> {'YES' if meta.get('risk_window_opening') else 'NO'}</p>",
+        f"<h3>Status history (last {len(runs)} runs)</h3>{history_svg(runs, names)}",
+        f"<h3>Context &amp; Interpretation (Non-Directive)</h3><ul>{commentary}</ul>",
+    ]
+    if news:
+        parts.append(f"<h3>Bad-news items detected (last 48h)</h3><ul>{news}</ul>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def write_site(html: str, path: Path = SITE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(html, encoding="utf-8")
@@ -0,0 +1,182 @@
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # snapshots are optional; the dashboard runs without pyarrow
+    pa = None
+
+from config import SNAPSHOT_DIR
+
+
+SNAPSHOT_PATH = Path(SNAPSHOT_DIR)
+PART_FILE = "part-{run_id}.parquet"  # one immutable file per run, so git stores each run once
+COMPACT_FILE = "compacted-{first}-{last}.parquet"
+# Unified schema of every file written so far; readers use it instead of opening each footer.
+# Dataset discovery skips "_"-prefixed files, so it never shows up as a fragment.
+SCHEMA_FILE = "_common_metadata"
+
+
+def flatten(d: dict, prefix: str = "") -> dict:
+    """
+    Flattens nested results into dotted columns, e.g. credit_stress.us_meta.fast_ma.
+    Numbers become float64 so a column keeps one type across runs; lists are stored as JSON.
+    """
+    out = {}
+    for k, v in d.items():
+        key = f"{prefix}.{k}" if prefix else str(k)
+        if isinstance(v, dict):
+            out.update(flatten(v, key))
+        elif isinstance(v, (list, tuple)):
+            out[key] = json.dumps(v, default=str)
+        elif v is None or isinstance(v, (bool, np.bool_, str)):
+            out[key] = bool(v) if isinstance(v, np.bool_) else v
+        elif isinstance(v, (int, float, np.number)):
+            out[key] = float(v)
+        else:
+            out[key] = str(v)
+    return out
+
+
+def _month_dir(root: Path, ts: datetime) -> Path:
+    # Hive-style partition so readers can prune whole months by predicate
+    return root / f"month={ts:%Y-%m}"
+
+
+def _write_parquet(table, path: Path):
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+def append_snapshot(results: dict, run_id: str = None, ts: datetime = None, root: Path = None):
+    """
+    Writes one flattened run as its own Parquet file inside the month partition.
+    Returns the written path, or None when pyarrow isn't installed.
+    """
+    if pa is None:
+        return None
+    root = Path(root) if root is not None else SNAPSHOT_PATH
+    ts = ts or datetime.now(timezone.utc)
+    run_id = run_id or ts.strftime("%Y%m%dT%H%M%SZ")
+
+    row = {"run_ts": ts, "run_id": run_id}
+    row.update(flatten(results))
+
+    table = pa.Table.from_pylist([row])
+    part = _month_dir(root, ts) / PART_FILE.format(run_id=run_id)
+    part.parent.mkdir(parents=True, exist_ok=True)
+    _write_parquet(table, part)
+    _update_schema(root, table.schema)
+    return part
+
+
+def _read_schema(root: Path):
+    path = root / SCHEMA_FILE
+    return pq.read_schema(path) if path.exists() else None
+
+
+def _update_schema(root: Path, schema):
+    # Columns appear/disappear as indicators change; permissive promotion widens types as needed
+    current = _read_schema(root)
+    if current is not None:
+        merged = pa.unify_schemas([current, schema], promote_options="permissive")
+        if merged.equals(current):
+            return
+        schema = merged
+    tmp = root / f"{SCHEMA_FILE}.{os.getpid()}.tmp"
+    pq.write_metadata(schema, tmp)
+    os.replace(tmp, root / SCHEMA_FILE)
+
+
+def compact_month(month: str, root: Path = None):
+    """
+    Merges a month partition's files (e.g. "2024-05") into one, for when a month is closed.
+    Returns the compacted path, or None if there was nothing to merge.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required to compact snapshots")
+    root = Path(root) if root is not None else SNAPSHOT_PATH
+    month_dir = root / f"month={month}"
+    parts = sorted(month_dir.glob("*.parquet"))
+    if len(parts) < 2:
+        return None
+
+    # Columns appear/disappear as indicators change; permissive promotion fills gaps with nulls
+    table = pa.concat_tables([pq.read_table(p) for p in parts], promote_options="permissive")
+    table = table.sort_by("run_ts")
+    run_ids = table.column("run_id").to_pylist()
+    out = month_dir / COMPACT_FILE.format(first=run_ids[0], last=run_ids[-1])
+    _write_parquet(table, out)
+    for p in parts:
+        if p != out:
+            p.unlink()
+    _update_schema(root, table.schema)
+    return out
+
+
+def compact_closed_months(now: datetime = None, root: Path = None) -> list:
+    """
+    Compacts every month before the current one that still has more than one file.
+    Cheap when there is nothing to do (a directory listing), so it runs on every run
+    and in practice compacts a month on the first run of the next one.
+    """
+    if pa is None:
+        return []
+    root = Path(root) if root is not None else SNAPSHOT_PATH
+    current = f"month={(now or datetime.now(timezone.utc)):%Y-%m}"
+    done = []
+    for month_dir in sorted(root.glob("month=*")):
+        if month_dir.name < current and len(list(month_dir.glob("*.parquet"))) > 1:
+            done.append(compact_month(month_dir.name.split("=", 1)[1], root=root))
+    return done
+
+
+def snapshot_dataset(root: Path = None):
+    """
+    The snapshot store as a pyarrow dataset (month partition column + unified schema).
+    The schema comes from the _common_metadata sidecar, so only the directory is listed
+    here; row data is read lazily by to_table().
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read snapshots")
+    root = Path(root) if root is not None else SNAPSHOT_PATH
+    partitioning = ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive")
+
+    schema = _read_schema(root) if root.exists() else None
+    if schema is None:
+        # Store written before the sidecar existed: unify once from the footers and keep the result
+        base = ds.dataset(root, format="parquet", partitioning=partitioning)
+        fragments = list(base.get_fragments())
+        if not fragments:
+            return base
+        schema = pa.unify_schemas([f.physical_schema for f in fragments], promote_options="permissive")
+        _update_schema(root, schema)
+    if "month" not in schema.names:
+        schema = schema.append(pa.field("month", pa.string()))
+    return ds.dataset(root, format="parquet", partitioning=partitioning, schema=schema)
+
+
+def read_snapshots(columns=None, filter=None, start: str = None, end: str = None, root: Path = None):
+    """
+    Reads snapshots into a DataFrame. `filter` is a pyarrow expression
+    (e.g. ds.field("asset_correlations.avg_corr") > 0.7); start/end are "YYYY-MM" months
+    and prune partitions before any data is read.
+    """
+    dataset = snapshot_dataset(root=root)
+
+    expr = filter
+    for cond in (
+        (ds.field("month") >= start) if start else None,
+        (ds.field("month") <= end) if end else None,
+    ):
+        if cond is not None:
+            expr = cond if expr is None else (expr & cond)
+
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
@@ -17,13 +17,16 @@ def save_state(state):
     STATE_PATH.write_text(json.dumps(state, indent=2))
 
 
-def add_run(state, green_count: int, statuses: dict):
+def add_run(state, green_count: int, statuses: dict, run_id: str = None):
     # statuses: dict like {"credit_stress":"GREEN", ...}
-    state["runs"].append({
+    run = {
         "ts": datetime.now(timezone.utc).isoformat(),
         "green_count": green_count,
         "statuses": statuses
-    })
+    }
+    if run_id:
+        run["run_id"] = run_id  # key into state/provenance for `dashboard.py replay`
+    state["runs"].append(run)
     # Keep last 60 runs max
     state["runs"] = state["runs"][-60:]
     return state
@@ -34,6 +37,11 @@ def last_n_runs(state, n: int):
 
 
 def compute_persistence_flags(state):
+    # Maintained incrementally by alerts.update_alerts; scan only if the engine hasn't run yet
+    rules = (state.get("alerts") or {}).get("rules", {})
+    if "risk_window_opening" in rules and "stand_down_persist" in rules:
+        return rules["risk_window_opening"]["active"], rules["stand_down_persist"]["active"]
+
     runs = state.get("runs", [])
 
     def last_n_all(cond, n):
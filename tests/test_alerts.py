@@ -0,0 +1,28 @@
+from alerts import default_rules, update_alerts
+
+
+def _run_statuses(statuses, rules):
+    state = {"runs": []}
+    active = []
+    for i, status in enumerate(statuses):
+        state["runs"].append({"ts": f"t{i:03d}", "green_count": 0, "statuses": {"credit_stress": status}})
+        update_alerts(state, rules)
+        active.append(state["alerts"]["rules"]["credit_stress_red_to_green"]["active"])
+    return active
+
+
+def test_red_to_green_fires_through_yellow():
+    rules = default_rules(["credit_stress"])
+    active = _run_statuses(["RED"] * 3 + ["YELLOW"] + ["GREEN"] * 5, rules)
+    assert active == [False] * 6 + [True] * 3
+
+
+def test_yellow_blip_keeps_held_transition():
+    rules = default_rules(["credit_stress"])
+    active = _run_statuses(["RED", "GREEN", "GREEN", "GREEN", "YELLOW", "GREEN"], rules)
+    assert active == [False, False, False, True, True, True]
+
+
+def test_green_after_green_does_not_fire():
+    rules = default_rules(["credit_stress"])
+    assert not any(_run_statuses(["GREEN", "YELLOW"] + ["GREEN"] * 5, rules))